@@ -1,32 +1,73 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.database import get_db
+from app.cache import LRUCache
+from app.database import AsyncSessionLocal, get_db
+from app.metrics import bcrypt_hash_seconds, bcrypt_queue_seconds
 from app import models
 from typing import Optional
+from uuid import UUID
 
 import os
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. min/max rounds are pinned to the configured cost so that
+# hashes made with any other cost are flagged for rehash on the next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+BCRYPT_CONCURRENCY = int(os.getenv("BCRYPT_CONCURRENCY", 2))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a small dedicated pool keeps it off the event
+# loop while capping how many CPU-bound hashes run at once.
+_hash_executor = ThreadPoolExecutor(max_workers=BCRYPT_CONCURRENCY, thread_name_prefix="bcrypt")
 
 # JWT config
 SECRET_KEY = os.getenv("JWT_SECRET", "secret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Stream tokens travel in the EventSource URL (and so in access logs); they
+# only open /feedback-requests/stream and expire quickly.
+STREAM_TOKEN_SCOPE = "stream"
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", 60))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+async def _run_hash(fn, *args):
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    loop = asyncio.get_running_loop()
+    result, queued, elapsed = await loop.run_in_executor(_hash_executor, timed)
+    bcrypt_queue_seconds.observe((), queued)
+    bcrypt_hash_seconds.observe((), elapsed)
+    return result
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password) -> tuple[bool, Optional[str]]:
+    """Return (valid, new_hash); new_hash is set when the stored cost is outdated."""
+    return await _run_hash(pwd_context.verify_and_update, plain_password, hashed_password)
 
-def hash_password(password):
-    return pwd_context.hash(password)
+async def hash_password(password):
+    return await _run_hash(pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -35,28 +76,123 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# Authenticated principals, keyed by user id. Entries expire after
+# PRINCIPAL_CACHE_TTL seconds and must be invalidated when a user changes.
+principal_cache = LRUCache(
+    maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", 300)),
+)
 
-SECRET_KEY = os.getenv("JWT_SECRET", "secret")  # Use .env later
-ALGORITHM = "HS256"
+# When enabled, get_current_principal trusts the signed role/name claims in
+# the token and never touches the database. Role changes then only take
+# effect once the user's token expires.
+AUTH_TRUST_CLAIMS = os.getenv("AUTH_TRUST_CLAIMS", "false").lower() in ("1", "true", "yes")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> models.User:
+
+@dataclass(frozen=True)
+class Principal:
+    id: UUID
+    name: str
+    role: str
+    # Not carried in token claims
+    email: Optional[str] = None
+
+
+def invalidate_principal(user_id) -> None:
+    principal_cache.pop(str(user_id))
+
+
+def decode_access_token(token: str, scope: Optional[str] = None) -> dict:
+    """Validate a token; ``scope`` must match its scope claim, so scoped
+    tokens are never accepted as regular access tokens."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None or payload.get("scope") != scope:
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def create_stream_token(principal: "Principal") -> str:
+    return create_access_token(
+        data={"sub": str(principal.id), "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS),
+    )
+
+
+async def load_user(user_id: str, db: AsyncSession) -> Principal:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
 
-    stmt = select(models.User).where(models.User.id == user_id)
+    stmt = select(models.User.id, models.User.name, models.User.role, models.User.email).where(
+        models.User.id == user_id
+    )
     result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = result.one_or_none()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
\ No newline at end of file
+    # Immutable, so one instance can be shared across requests and tasks
+    principal = Principal(id=user.id, name=user.name, role=user.role, email=user.email)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Identity checked against the users table (or the principal cache),
+    never the token claims alone; for write routes."""
+    payload = decode_access_token(token)
+    return await load_user(payload["sub"], db)
+
+
+async def _principal_from_token(token: str, db: AsyncSession, scope: Optional[str] = None) -> Principal:
+    payload = decode_access_token(token, scope)
+    if AUTH_TRUST_CLAIMS and "role" in payload and "name" in payload:
+        try:
+            user_id = UUID(payload["sub"])
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return Principal(id=user_id, name=payload["name"], role=payload["role"])
+
+    return await load_user(payload["sub"], db)
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Lightweight identity for read-only routes that only need id and role."""
+    return await _principal_from_token(token, db)
+
+
+async def _principal_outside_request(token: str, scope: Optional[str] = None) -> Principal:
+    # A session of its own, closed as soon as the user is loaded, so a
+    # long-lived response does not pin a pooled connection via get_db
+    async with AsyncSessionLocal() as db:
+        return await _principal_from_token(token, db, scope)
+
+
+async def get_streaming_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """get_current_principal for routes returning a StreamingResponse."""
+    return await _principal_outside_request(token)
+
+
+async def get_stream_principal(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+) -> Principal:
+    """Like get_streaming_principal, but also accepts ``?access_token=`` since
+    browser EventSource connections cannot send an Authorization header.
+    The query parameter only takes a short-lived stream token (see
+    create_stream_token), never a regular access token."""
+    if token:
+        return await _principal_outside_request(token)
+    if access_token:
+        return await _principal_outside_request(access_token, STREAM_TOKEN_SCOPE)
+    raise HTTPException(status_code=401, detail="Not authenticated")
@@ -1,18 +1,101 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
 import os
 from dotenv import load_dotenv
 
+from app.instrumentation import TimedAsyncQueuePool
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL is None:
-    raise ValueError("DATABASE_URL environment variable is not set.")
+
+# Optional read replica for read-only routes; falls back to the primary
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or None
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def engine_options(url: str) -> dict:
+    """Engine/pool settings, driven by environment variables."""
+    options = {
+        "echo": _env_flag("SQL_ECHO", False),
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", True),
+    }
+    if "asyncpg" in url:
+        # Set to 0 behind pgbouncer in transaction mode
+        options["connect_args"] = {
+            "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100)),
+        }
+    return options
+
+
+def database_url() -> str:
+    if DATABASE_URL is None:
+        raise ValueError("DATABASE_URL environment variable is not set.")
+    return DATABASE_URL
+
+
+def driver_dsn(url: str) -> str:
+    """Plain postgresql:// DSN for direct asyncpg connections."""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        yield session
+
+# Engines are created on first use rather than at import, so importing the
+# app (cold starts, CLIs, tooling) neither needs DATABASE_URL nor pays for
+# engine construction.
+_engines: dict[str, AsyncEngine] = {}
+
+
+def get_engine() -> AsyncEngine:
+    if "primary" not in _engines:
+        url = database_url()
+        _engines["primary"] = create_async_engine(url, **engine_options(url))
+    return _engines["primary"]
+
+
+def get_read_engine() -> AsyncEngine:
+    if not READ_DATABASE_URL:
+        return get_engine()
+    if "replica" not in _engines:
+        _engines["replica"] = create_async_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL))
+    return _engines["replica"]
+
+
+def active_engines() -> list[tuple[str, AsyncEngine]]:
+    """(name, engine) for the engines created so far."""
+    return list(_engines.items())
+
+
+class LazySessionmaker:
+    """async_sessionmaker that creates its engine on the first session."""
+
+    def __init__(self, get_bind):
+        self._get_bind = get_bind
+        self._factory = None
+
+    def __call__(self, **kwargs) -> AsyncSession:
+        if self._factory is None:
+            self._factory = async_sessionmaker(self._get_bind(), expire_on_commit=False)
+        return self._factory(**kwargs)
+
+
+AsyncSessionLocal = LazySessionmaker(get_engine)
+ReadSessionLocal = LazySessionmaker(get_read_engine)
+
 Base = declarative_base()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from app import models
+from app.database import AsyncSessionLocal
+from app.notifications import NOTIFY_COLUMNS, notify_requests
+
+FEEDBACK_REQUEST_TTL_DAYS = float(os.getenv("FEEDBACK_REQUEST_TTL_DAYS", 30))
+EXPIRY_BATCH_SIZE = int(os.getenv("EXPIRY_BATCH_SIZE", 500))
+EXPIRY_INTERVAL = float(os.getenv("EXPIRY_INTERVAL", 3600))
+
+
+class RequestExpiryWorker:
+    """Marks pending feedback requests older than FEEDBACK_REQUEST_TTL_DAYS
+    as expired, in batches.
+
+    Each batch is its own short transaction over rows claimed with
+    ``FOR UPDATE SKIP LOCKED``, so it never blocks a feedback being written
+    and several app workers can run it at once.
+    """
+
+    def __init__(
+        self,
+        ttl_days: float = FEEDBACK_REQUEST_TTL_DAYS,
+        batch_size: int = EXPIRY_BATCH_SIZE,
+        interval: float = EXPIRY_INTERVAL,
+    ):
+        self.ttl = timedelta(days=ttl_days)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stats = {"expired": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                while await self.expire_once() == self.batch_size:
+                    # Let other tasks in between full batches
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("❌ Feedback request expiry error:", e)
+            await asyncio.sleep(self.interval)
+
+    async def expire_once(self) -> int:
+        """Expire one batch of stale requests. Returns the number expired."""
+        cutoff = datetime.now(timezone.utc) - self.ttl
+        async with AsyncSessionLocal() as db:
+            stale = (
+                select(models.FeedbackRequest.id)
+                .where(
+                    models.FeedbackRequest.status == "pending",
+                    models.FeedbackRequest.created_at < cutoff,
+                )
+                .order_by(models.FeedbackRequest.created_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                # Claim the batch exactly once: as an IN subquery Postgres
+                # may rescan it per row and pick up more than batch_size
+                .cte("stale")
+                .prefix_with("MATERIALIZED")
+            )
+            result = await db.execute(
+                update(models.FeedbackRequest)
+                .where(
+                    models.FeedbackRequest.id == stale.c.id,
+                    models.FeedbackRequest.status == "pending",
+                )
+                .values(status="expired")
+                .returning(*(models.FeedbackRequest.__table__.c[name] for name in NOTIFY_COLUMNS))
+                .execution_options(synchronize_session=False)
+            )
+            expired = result.all()
+            await notify_requests(db, expired)
+            await db.commit()
+        self.stats["expired"] += len(expired)
+        return len(expired)
+
+
+expiry_worker = RequestExpiryWorker()
@@ -0,0 +1,240 @@
+"""Bulk import of users and team assignments from an HR roster.
+
+Usage:
+    python -m app.importer roster.csv [--report outcomes.ndjson] [--workers N] [--batch-size N]
+
+The roster is CSV with a header row, or NDJSON (.ndjson / .jsonl) with one
+object per line. Each row is a user with name, email, role and password,
+plus an optional manager_email that puts the user in that manager's team.
+The manager can be another row of the same roster or an existing user.
+
+Passwords are hashed across a process pool, and users and team rows are
+written with batched multi-row INSERT ... ON CONFLICT DO NOTHING. Existing
+emails and assignments are skipped, and each batch commits on its own, so an
+interrupted import can simply be run again.
+
+One outcome per roster row is written as NDJSON to --report (default
+stdout); a summary goes to stderr.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from app import models, schemas
+from app.auth import pwd_context
+from app.database import AsyncSessionLocal
+
+DEFAULT_BATCH_SIZE = 1000
+# asyncpg binds at most 32767 parameters per statement, and each user row
+# of the INSERT takes 5
+MAX_BATCH_SIZE = 32767 // 5
+
+
+def read_roster(path: str) -> Iterator[tuple[int, Optional[dict]]]:
+    """Yield (line number, raw row); malformed NDJSON lines yield None."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+        else:
+            # Line 1 is the header
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                yield line_no, row
+
+
+def _validate(raw) -> tuple[Optional[schemas.UserCreate], Optional[str], Optional[str]]:
+    """Return (user, manager_email, error)."""
+    if not isinstance(raw, dict):
+        return None, None, "Malformed row"
+    fields = {key: str(raw.get(key) or "").strip() for key in ("name", "email", "password", "role")}
+    manager_email = str(raw.get("manager_email") or "").strip() or None
+    try:
+        user = schemas.UserCreate(**fields)
+    except ValidationError as e:
+        return None, None, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+    if not user.name or not user.password:
+        return None, None, "name and password are required"
+    return user, manager_email, None
+
+
+def _hash_chunk(passwords: list[str]) -> list[str]:
+    # Runs in a worker process
+    return [pwd_context.hash(password) for password in passwords]
+
+
+async def _hash_all(pool: ProcessPoolExecutor, workers: int, passwords: list[str]) -> list[str]:
+    loop = asyncio.get_running_loop()
+    size = max(1, math.ceil(len(passwords) / workers))
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    hashed = await asyncio.gather(*(loop.run_in_executor(pool, _hash_chunk, chunk) for chunk in chunks))
+    return [password_hash for chunk in hashed for password_hash in chunk]
+
+
+def _batches(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def _import_users(db, pool, workers, rows, outcomes, batch_size):
+    for batch in _batches(rows, batch_size):
+        emails = [user.email for _, user, _ in batch]
+        result = await db.execute(select(models.User.email).where(models.User.email.in_(emails)))
+        existing = set(result.scalars().all())
+        # End the read transaction so no connection is held while hashing;
+        # the insert below runs in a transaction of its own
+        await db.commit()
+
+        # Only hash passwords for users that will actually be inserted
+        new_rows = [(line, user) for line, user, _ in batch if user.email not in existing]
+        for line, user, _ in batch:
+            if user.email in existing:
+                outcomes[line].update(user="exists")
+        if not new_rows:
+            continue
+
+        hashes = await _hash_all(pool, workers, [user.password for _, user in new_rows])
+        stmt = (
+            pg_insert(models.User)
+            .values([
+                {
+                    "id": uuid4(),
+                    "name": user.name,
+                    "email": user.email,
+                    "password_hash": password_hash,
+                    "role": user.role.value,
+                }
+                for (_, user), password_hash in zip(new_rows, hashes)
+            ])
+            .on_conflict_do_nothing(index_elements=[models.User.email])
+            .returning(models.User.email)
+        )
+        result = await db.execute(stmt)
+        created = set(result.scalars().all())
+        await db.commit()
+
+        for line, user in new_rows:
+            # Not returned means a concurrent writer registered the email first
+            outcomes[line].update(user="created" if user.email in created else "exists")
+
+
+async def _import_teams(db, rows, outcomes, batch_size):
+    assignments = [(line, user.email, manager_email) for line, user, manager_email in rows if manager_email]
+    if not assignments:
+        return
+
+    users = {}
+    emails = list({email for _, employee, manager in assignments for email in (employee, manager)})
+    for batch in _batches(emails, batch_size):
+        stmt = select(models.User.email, models.User.id, models.User.role).where(models.User.email.in_(batch))
+        result = await db.execute(stmt)
+        users.update({email: (user_id, role) for email, user_id, role in result.all()})
+
+    pending = []
+    for line, employee_email, manager_email in assignments:
+        employee, manager = users.get(employee_email), users.get(manager_email)
+        if manager is None:
+            outcomes[line].update(team="rejected", detail=f"Manager {manager_email} not found")
+        elif manager[1] != "manager":
+            outcomes[line].update(team="rejected", detail=f"{manager_email} is not a manager")
+        elif employee is None or employee[1] != "employee":
+            outcomes[line].update(team="rejected", detail="Only employees can be assigned to a team")
+        else:
+            pending.append((line, manager[0], employee[0]))
+
+    for batch in _batches(pending, batch_size):
+        stmt = (
+            pg_insert(models.Team)
+            .values([{"manager_id": manager_id, "employee_id": employee_id} for _, manager_id, employee_id in batch])
+            .on_conflict_do_nothing(index_elements=[models.Team.manager_id, models.Team.employee_id])
+            .returning(models.Team.manager_id, models.Team.employee_id)
+        )
+        result = await db.execute(stmt)
+        assigned = {tuple(row) for row in result.all()}
+        await db.commit()
+        for line, manager_id, employee_id in batch:
+            outcomes[line].update(team="assigned" if (manager_id, employee_id) in assigned else "exists")
+
+
+async def import_roster(path: str, pool: ProcessPoolExecutor, workers: int, batch_size: int = DEFAULT_BATCH_SIZE) -> list[dict]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    batch_size = min(batch_size, MAX_BATCH_SIZE)
+    outcomes = {}
+    rows = []
+    seen = set()
+    for line, raw in read_roster(path):
+        user, manager_email, error = _validate(raw)
+        email = user.email if user else (raw.get("email") if isinstance(raw, dict) else None)
+        outcomes[line] = {"line": line, "email": email, "user": None, "team": None, "detail": None}
+        if error is None and user.email in seen:
+            error = "Duplicate email in roster"
+        if error is not None:
+            outcomes[line].update(user="rejected", detail=error)
+            continue
+        seen.add(user.email)
+        rows.append((line, user, manager_email))
+
+    async with AsyncSessionLocal() as db:
+        await _import_users(db, pool, workers, rows, outcomes, batch_size)
+        await _import_teams(db, rows, outcomes, batch_size)
+    return list(outcomes.values())
+
+
+def _batch_size(value: str) -> int:
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return min(size, MAX_BATCH_SIZE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import users and team assignments")
+    parser.add_argument("roster", help="CSV or NDJSON roster file")
+    parser.add_argument("--report", default="-", help="where to write per-row outcomes (default stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="password hashing processes")
+    parser.add_argument(
+        "--batch-size", type=_batch_size, default=DEFAULT_BATCH_SIZE,
+        help=f"rows per INSERT (at most {MAX_BATCH_SIZE})",
+    )
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = asyncio.run(import_roster(args.roster, pool, args.workers, args.batch_size))
+
+    report = sys.stdout if args.report == "-" else open(args.report, "w", encoding="utf-8")
+    try:
+        for outcome in outcomes:
+            report.write(json.dumps(outcome) + "\n")
+    finally:
+        if report is not sys.stdout:
+            report.close()
+
+    users = Counter(outcome["user"] for outcome in outcomes)
+    teams = Counter(outcome["team"] for outcome in outcomes if outcome["team"])
+    print(
+        f"✅ Imported {len(outcomes)} rows: {users['created']} users created, {users['exists']} existing, "
+        f"{users['rejected']} rejected; {teams['assigned']} team assignments, {teams['exists']} existing, "
+        f"{teams['rejected']} rejected",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
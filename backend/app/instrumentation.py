@@ -0,0 +1,106 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger("app.sql")
+
+# Warn when one statement shape runs more often than this within a request
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", 10))
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        context._started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - getattr(context, "_started_at", time.perf_counter())
+    # Bound parameters are not part of the statement text, so identical
+    # text means identical shape.
+    stats.shapes[statement] += 1
+    if stats.shapes[statement] == SQL_REPEAT_THRESHOLD + 1:
+        logger.warning(
+            "Possible N+1: statement ran more than %d times in one request: %s",
+            SQL_REPEAT_THRESHOLD,
+            " ".join(statement.split())[:200],
+        )
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        stats = _request_stats.get()
+        if stats is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats.pool_wait_seconds += time.perf_counter() - started
+
+
+class SQLTimingMiddleware:
+    """Pure ASGI middleware that reports per-request SQL statistics as
+    ``Server-Timing`` headers: statement count, total DB time and time spent
+    waiting for a pooled connection."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+                    f"db-pool;dur={stats.pool_wait_seconds * 1000:.2f}, "
+                    f"app;dur={total_ms:.2f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
@@ -1,12 +1,16 @@
+import time
+_import_started = time.perf_counter()
+
 from contextlib import asynccontextmanager
 import os
 from sqlite3 import IntegrityError
 from fastapi import Depends, FastAPI, HTTPException
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import engine, AsyncSessionLocal, get_db
+from app.database import AsyncSessionLocal, get_db
 from app import models, schemas
-from app.utils import hash_password
+from app.outbox import email_worker
+from app.expiry import expiry_worker
+from app.notifications import notification_hub
 from app.routes import tags
 from app.routes import feedbacks
 from app.routes import dashboard
@@ -14,18 +18,50 @@ from app.routes import auth
 from app.routes import feedback_requests
 from app.routes import teams
 from app.routes import unassigned_employees
+from app.routes import metrics
+from app.routes import health
 from fastapi.middleware.cors import CORSMiddleware
+from app.instrumentation import SQLTimingMiddleware
+from app.metrics import MetricsMiddleware
+from app.migrate import migrate
+from app.startup import startup_stats, warm_up
+
+startup_stats["import_seconds"] = time.perf_counter() - _import_started
+
+EMAIL_WORKER_ENABLED = os.getenv("EMAIL_WORKER_ENABLED", "true").lower() not in ("0", "false", "no")
+EXPIRY_WORKER_ENABLED = os.getenv("EXPIRY_WORKER_ENABLED", "true").lower() not in ("0", "false", "no")
+# Turn off where `python -m app.migrate` runs as a separate deploy step
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() not in ("0", "false", "no")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    if MIGRATE_ON_STARTUP:
+        try:
+            await migrate()
+        except Exception as e:
+            print("❌ Migration error:", e)
     try:
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
-        print("Connected to PostgreSQL")
+        await warm_up()
+        if startup_stats["warm_connections"]:
+            print("Connected to PostgreSQL")
     except Exception as e:
+        # Keep serving; /readyz reports unavailable and retries the warm-up
         print("DB Connection Error:", e)
+    if EMAIL_WORKER_ENABLED:
+        email_worker.start()
+    if EXPIRY_WORKER_ENABLED:
+        expiry_worker.start()
+    startup_stats["startup_seconds"] = time.perf_counter() - started
+    print(
+        f"🚀 Imported in {startup_stats['import_seconds']:.3f}s, started in "
+        f"{startup_stats['startup_seconds']:.3f}s ({startup_stats['warm_connections']} warm connections)"
+    )
     yield
+    await email_worker.stop()
+    await expiry_worker.stop()
+    await notification_hub.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -40,6 +76,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SQLTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 
@@ -52,4 +90,6 @@ app.include_router(feedbacks.router)
 app.include_router(dashboard.router)
 app.include_router(feedback_requests.router)
 app.include_router(teams.router)
-app.include_router(unassigned_employees.router)
\ No newline at end of file
+app.include_router(unassigned_employees.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
@@ -0,0 +1,99 @@
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by a tuple of label values.
+
+    Observations only touch one bucket counter; cumulative counts are
+    computed when the metrics are rendered.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # bucket counts (+Inf last), sum, count
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total, count) in self._series.items():
+            base = _format_labels(zip(self.labelnames, labels))
+            prefix = f"{base}," if base else ""
+            suffix = f"{{{base}}}" if base else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}'
+            yield f"{self.name}_sum{suffix} {total}"
+            yield f"{self.name}_count{suffix} {count}"
+
+
+def _format_labels(pairs) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in pairs)
+
+
+def gauge(name: str, help: str, samples: Iterable[tuple[dict, float]], kind: str = "gauge") -> Iterable[str]:
+    yield f"# HELP {name} {help}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        if labels:
+            yield f"{name}{{{_format_labels(labels.items())}}} {value}"
+        else:
+            yield f"{name} {value}"
+
+
+request_latency = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by router and route.",
+    ("router", "route", "method"),
+)
+in_flight = {"requests": 0}
+bcrypt_hash_seconds = Histogram("bcrypt_hash_seconds", "Time spent hashing/verifying a password.", ())
+bcrypt_queue_seconds = Histogram("bcrypt_queue_seconds", "Time a password hash waited for a bcrypt thread.", ())
+email_send_seconds = Histogram("email_send_seconds", "Time taken by an email send attempt.", ())
+
+
+def _route_labels(scope) -> tuple:
+    route = scope.get("route")
+    if route is None:
+        return ("none", "unmatched", scope["method"])
+    # app.routes.feedbacks -> feedbacks, app.main -> main
+    router = route.endpoint.__module__.rsplit(".", 1)[-1]
+    return (router, route.path, scope["method"])
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        in_flight["requests"] += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            in_flight["requests"] -= 1
+            request_latency.observe(_route_labels(scope), time.perf_counter() - started)
@@ -0,0 +1,70 @@
+"""Apply pending SQL migrations from backend/migrations.
+
+Usage: python -m app.migrate [--list]
+
+Migrations are applied in file-name order and recorded in
+schema_migrations. A file whose first line is ``-- migrate: no-transaction``
+runs statement by statement outside a transaction, which CREATE INDEX
+CONCURRENTLY requires; every other file runs in a single transaction.
+
+The app also runs this at startup (MIGRATE_ON_STARTUP, default on), so a
+checkout always has the schema its models expect. An advisory lock lets
+several workers start at once: one applies, the others wait and skip.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import asyncpg
+
+from app.database import database_url, driver_dsn
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+NO_TRANSACTION = "-- migrate: no-transaction"
+# pg_advisory_lock key serialising concurrent runs
+_LOCK_KEY = 0x6D696772
+
+
+def _statements(sql: str) -> list[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+async def migrate(list_only: bool = False):
+    conn = await asyncpg.connect(driver_dsn(database_url()))
+    try:
+        # Session-level; released when the connection closes. Polled rather
+        # than awaited: a session blocked in pg_advisory_lock holds a
+        # transaction open, which CREATE INDEX CONCURRENTLY waits for.
+        while not await conn.fetchval("SELECT pg_try_advisory_lock($1)", _LOCK_KEY):
+            await asyncio.sleep(0.5)
+        await conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version TEXT PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+        applied = {row["version"] for row in await conn.fetch("SELECT version FROM schema_migrations")}
+
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            version = path.stem
+            if list_only:
+                print(f"{'applied' if version in applied else 'pending'}  {version}")
+                continue
+            if version in applied:
+                continue
+
+            sql = path.read_text()
+            if sql.startswith(NO_TRANSACTION):
+                for statement in _statements(sql):
+                    await conn.execute(statement)
+                await conn.execute("INSERT INTO schema_migrations (version) VALUES ($1)", version)
+            else:
+                async with conn.transaction():
+                    await conn.execute(sql)
+                    await conn.execute("INSERT INTO schema_migrations (version) VALUES ($1)", version)
+            print(f"✅ Applied migration {version}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate(list_only="--list" in sys.argv))
@@ -1,6 +1,6 @@
-from sqlalchemy import Boolean, Column, ForeignKey, String, Text, Enum, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Computed, Date, Float, ForeignKey, Index, Integer, String, Text, Enum, DateTime, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 import enum
@@ -21,7 +21,14 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(Text, nullable=False)
     role = Column(String, nullable=False)
-    __table_args__ = (CheckConstraint("role IN ('manager', 'employee')", name="check_role_valid"),)
+    __table_args__ = (
+        CheckConstraint("role IN ('manager', 'employee')", name="check_role_valid"),
+        # Keyset pagination on (name, id) for /unassigned-employees
+        Index("ix_users_role_name", "role", "name", "id"),
+        # Prefix search for the assign-employee picker (requires pg_trgm)
+        Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class Tag(Base):
@@ -51,6 +58,15 @@ class Feedback(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     acknowledged = Column(Boolean, default=False)
     employee_reply = Column(Text, nullable=True)
+    # Full-text search document, maintained by Postgres; deferred so regular
+    # loads never fetch it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(strengths, '') || ' ' || coalesce(areas_to_improve, ''))",
+            persisted=True,
+        ),
+    ))
 
     tags = relationship(
         "Tag",
@@ -59,6 +75,16 @@ class Feedback(Base):
     )
     employee = relationship("User", foreign_keys=[employee_id])
 
+    __table_args__ = (
+        # Keyset pagination on (created_at, id) for /feedbacks/me and /feedbacks/employee/{id}
+        Index("ix_feedbacks_employee_created", "employee_id", "created_at", "id"),
+        Index("ix_feedbacks_manager_employee_created", "manager_id", "employee_id", "created_at", "id"),
+        # Dashboard and export scans of a manager's history
+        Index("ix_feedbacks_manager_created", "manager_id", "created_at"),
+        Index("ix_feedbacks_created_at", "created_at"),
+        Index("ix_feedbacks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 # Feedback Request
 class FeedbackRequest(Base):
     __tablename__ = "feedback_requests"
@@ -67,12 +93,24 @@ class FeedbackRequest(Base):
     employee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     manager_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     message = Column(String, nullable=True)
-    status = Column(String, default="pending")  # pending / fulfilled / rejected
+    status = Column(String, default="pending")  # pending / fulfilled / rejected / expired
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     employee = relationship("User", foreign_keys=[employee_id])
     manager = relationship("User", foreign_keys=[manager_id])
 
+    __table_args__ = (
+        # Keyset pagination on (created_at, id) for /feedback-requests/notifications
+        Index("ix_feedback_requests_manager_created", "manager_id", "created_at", "id"),
+        Index("ix_feedback_requests_manager_status", "manager_id", "status"),
+        # Fulfilment on feedback creation, and the expiry job's scan
+        Index(
+            "ix_feedback_requests_pending", "manager_id", "employee_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_feedback_requests_pending_created", "created_at", postgresql_where=text("status = 'pending'")),
+    )
+
 
 class Team(Base):
     __tablename__ = "teams"
@@ -84,4 +122,50 @@ class Team(Base):
 
     __table_args__ = (
         CheckConstraint("manager_id != employee_id", name="check_manager_employee_different"),
-    )
\ No newline at end of file
+        # The primary key leads with manager_id; lookups by employee need their own index
+        Index("ix_teams_employee_id", "employee_id"),
+    )
+
+
+# Feedback counts per (manager, employee, week or month, sentiment), kept in
+# step with feedbacks by app.trends so /dashboard/trends never scans history
+class FeedbackSentimentRollup(Base):
+    __tablename__ = "feedback_sentiment_rollups"
+
+    manager_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String, primary_key=True)  # week / month
+    bucket = Column(Date, primary_key=True)  # first day of the UTC week or month
+    employee_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    sentiment = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Outgoing email, written in the same transaction as the row that triggers it
+# and drained by app.outbox.EmailOutboxWorker
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending / sent / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_pending", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+    )
+
+
+# Token buckets for app.ratelimit's postgres backend. UNLOGGED: losing the
+# buckets in a crash only resets the limits.
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String, primary_key=True)
+    tat = Column(Float, nullable=False)  # theoretical arrival time, epoch seconds
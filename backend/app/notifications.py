@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import Iterable, Optional
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Text, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import database_url, driver_dsn
+
+CHANNEL = "feedback_requests"
+# Columns a NOTIFY payload carries; callers RETURNING just these is enough
+NOTIFY_COLUMNS = ("id", "manager_id", "employee_id", "status", "message", "created_at")
+# NOTIFY payloads are limited to 8000 bytes: the employee name is capped in
+# characters (at most 6 bytes each once JSON-escaped) and the message fills
+# what is left of the budget, measured in encoded bytes.
+_EMPLOYEE_NAME_CHARS = 100
+_PAYLOAD_BUDGET = 7000
+
+# The employee name is joined in the same statement, so a notification costs
+# no extra round trip
+_NOTIFY = text(
+    "SELECT pg_notify(:channel, (p.payload::jsonb"
+    " || jsonb_build_object('employee_name', left(u.name, :name_chars)))::text)"
+    " FROM unnest(:payloads) AS p(payload)"
+    " LEFT JOIN users u ON u.id = (p.payload::jsonb ->> 'employee_id')::uuid"
+).bindparams(bindparam("payloads", type_=ARRAY(Text)))
+
+
+def _encoded_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False).encode())
+
+
+def _payload(row) -> str:
+    payload = {
+        "id": str(row.id),
+        "manager_id": str(row.manager_id),
+        "employee_id": str(row.employee_id),
+        "status": row.status,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "message": "",
+        "message_truncated": False,
+    }
+    message = row.message or ""
+    available = _PAYLOAD_BUDGET - _encoded_size(payload)
+    if _encoded_size(message) - 2 > available:
+        # Longest prefix whose escaped UTF-8 form fits
+        low, high = 0, len(message)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if _encoded_size(message[:mid]) - 2 <= available:
+                low = mid
+            else:
+                high = mid - 1
+        message = message[:low]
+        payload["message_truncated"] = True
+    payload["message"] = message if row.message is not None else None
+    return json.dumps(payload, ensure_ascii=False)
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 100))
+
+
+async def notify_requests(db: AsyncSession, rows: Iterable) -> None:
+    """Queue a NOTIFY for each FeedbackRequest row, in one statement.
+
+    Postgres delivers the notifications only when the caller's transaction
+    commits, so listeners never see rows that were rolled back. Payloads
+    carry what the notifications list shows, so clients need not refetch;
+    a long message is cut to fit and flagged with ``message_truncated``.
+    """
+    payloads = [_payload(row) for row in rows]
+    if not payloads:
+        return
+    await db.execute(_NOTIFY, {"channel": CHANNEL, "payloads": payloads, "name_chars": _EMPLOYEE_NAME_CHARS})
+
+
+class NotificationHub:
+    """Fans out ``feedback_requests`` notifications to in-process subscribers.
+
+    One dedicated LISTEN connection per worker process serves every
+    subscriber; each subscriber is a bounded asyncio.Queue keyed by the
+    manager it belongs to, so idle subscribers cost no database resources.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, manager_id: UUID) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self._subscribers[manager_id].add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, manager_id: UUID, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(manager_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[manager_id]
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, connection, pid, channel, payload: str):
+        try:
+            manager_id = UUID(json.loads(payload)["manager_id"])
+        except (ValueError, KeyError):
+            return
+        for queue in self._subscribers.get(manager_id, ()):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Slow client; it can catch up from /notifications
+                pass
+
+    async def _listen(self):
+        dsn = driver_dsn(database_url())
+        backoff = 1.0
+        while self._subscribers:
+            terminated = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                print("❌ LISTEN connection failed:", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            backoff = 1.0
+            try:
+                conn.add_termination_listener(lambda _: terminated.set())
+                await conn.add_listener(CHANNEL, self._dispatch)
+                # Stay connected while anyone is listening
+                while self._subscribers and not terminated.is_set():
+                    try:
+                        await asyncio.wait_for(terminated.wait(), timeout=SSE_HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+
+notification_hub = NotificationHub()
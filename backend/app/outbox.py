@@ -0,0 +1,233 @@
+import asyncio
+import os
+import smtplib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import models
+from app.database import AsyncSessionLocal
+from app.metrics import email_send_seconds
+from app.utils import (
+    SMTP_HOST,
+    SMTP_PASS,
+    SMTP_PORT,
+    SMTP_STARTTLS,
+    SMTP_TIMEOUT,
+    SMTP_USER,
+    build_email,
+)
+
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 20))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", 5))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+EMAIL_BACKOFF_BASE = float(os.getenv("EMAIL_BACKOFF_BASE", 30))
+EMAIL_BACKOFF_MAX = float(os.getenv("EMAIL_BACKOFF_MAX", 3600))
+# How long claimed rows stay invisible to other workers; must exceed the time
+# to send a whole batch (EMAIL_BATCH_SIZE x SMTP_TIMEOUT)
+EMAIL_LEASE_SECONDS = float(os.getenv("EMAIL_LEASE_SECONDS", 600))
+
+
+def queue_email(db: AsyncSession, to_email: str, subject: str, body: str) -> models.EmailOutbox:
+    """Add an email to the outbox. It is sent once the caller's transaction commits."""
+    email = models.EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(email)
+    return email
+
+
+class EmailOutboxWorker:
+    """Drains ``email_outbox`` over one persistent SMTP connection.
+
+    smtplib is blocking, so every SMTP call runs in a worker thread; the
+    connection is opened lazily, reused across batches and reopened when the
+    server drops it. Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so
+    several app workers can drain the same table.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        poll_interval: float = EMAIL_POLL_INTERVAL,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        backoff_base: float = EMAIL_BACKOFF_BASE,
+        backoff_max: float = EMAIL_BACKOFF_MAX,
+        lease_seconds: float = EMAIL_LEASE_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.stats = {
+            "queue_depth": 0,
+            "sent": 0,
+            "retried": 0,
+            "failed": 0,
+        }
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self._close)
+
+    def notify(self):
+        """Wake the worker up instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("❌ Email outbox error:", e)
+                claimed = 0
+
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """Send one batch of due emails. Returns the number of rows claimed.
+
+        Rows are leased in a short transaction (next_attempt_at is pushed
+        EMAIL_LEASE_SECONDS ahead, so other workers skip them), sent with no
+        transaction open, and their outcome is written in a second short
+        transaction. If the worker dies mid-batch the lease simply expires
+        and the rows are picked up again.
+        """
+        async with AsyncSessionLocal() as db:
+            due = (
+                select(models.EmailOutbox.id)
+                .where(
+                    models.EmailOutbox.status == "pending",
+                    models.EmailOutbox.next_attempt_at <= func.now(),
+                )
+                .order_by(models.EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                # Lease the batch exactly once: as an IN subquery Postgres
+                # may rescan it per row and pick up more than batch_size
+                .cte("due")
+                .prefix_with("MATERIALIZED")
+            )
+            result = await db.execute(
+                update(models.EmailOutbox)
+                .where(models.EmailOutbox.id == due.c.id)
+                .values(next_attempt_at=func.now() + timedelta(seconds=self.lease_seconds))
+                .returning(
+                    models.EmailOutbox.id,
+                    models.EmailOutbox.to_email,
+                    models.EmailOutbox.subject,
+                    models.EmailOutbox.body,
+                    models.EmailOutbox.attempts,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            emails = result.all()
+
+            stmt = select(func.count()).where(models.EmailOutbox.status == "pending")
+            self.stats["queue_depth"] = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+
+        outcomes = []
+        for email in emails:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._send, email.to_email, email.subject, email.body)
+            except Exception as e:
+                outcomes.append((email.id, self._failure_values(email, e)))
+            else:
+                outcomes.append((email.id, {"status": "sent", "sent_at": datetime.now(timezone.utc)}))
+                self.stats["sent"] += 1
+            finally:
+                email_send_seconds.observe((), time.perf_counter() - started)
+
+        if outcomes:
+            async with AsyncSessionLocal() as db:
+                for email_id, values in outcomes:
+                    await db.execute(
+                        update(models.EmailOutbox)
+                        .where(models.EmailOutbox.id == email_id)
+                        .values(**values)
+                        .execution_options(synchronize_session=False)
+                    )
+                await db.commit()
+        return len(emails)
+
+    def _failure_values(self, email, error: Exception) -> dict:
+        attempts = email.attempts + 1
+        values = {"attempts": attempts, "last_error": str(error)}
+        if attempts >= self.max_attempts:
+            values["status"] = "failed"
+            self.stats["failed"] += 1
+            print(f"❌ Email to {email.to_email} failed permanently:", error)
+            return values
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        values["next_attempt_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        self.stats["retried"] += 1
+        return values
+
+    # The methods below run in a worker thread.
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+            try:
+                if SMTP_STARTTLS:
+                    smtp.starttls()
+                if SMTP_USER and SMTP_PASS:
+                    smtp.login(SMTP_USER, SMTP_PASS)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+        return self._smtp
+
+    def _send(self, to_email: str, subject: str, body: str):
+        msg = build_email(to_email, subject, body)
+        try:
+            self._connection().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connection closed by the server; reconnect once
+            self._close()
+            self._connection().send_message(msg)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # Rejected by the server; the connection itself is still usable
+            raise
+        except OSError:
+            self._close()
+            raise
+        print(f"📧 Email sent to {to_email}")
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except OSError:
+                pass
+            self._smtp = None
+
+
+email_worker = EmailOutboxWorker()
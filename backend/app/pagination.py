@@ -0,0 +1,59 @@
+import base64
+import os
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE", 20))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+
+def encode_cursor(key, row_id: UUID) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = f"{key}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        # Ids never contain "|", keys (e.g. names) might
+        key, row_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return key, UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(stmt, created_col, id_col, cursor: Optional[str], limit: int):
+    """Apply (created_at, id) descending keyset pagination to a select.
+
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def name_keyset(stmt, name_col, id_col, cursor: Optional[str], limit: int):
+    """Apply (name, id) ascending keyset pagination to a select."""
+    if cursor:
+        stmt = stmt.where(tuple_(name_col, id_col) > tuple_(*decode_cursor(cursor)))
+    return stmt.order_by(name_col, id_col).limit(limit + 1)
+
+
+def page(rows, limit: int, key: str = "created_at") -> dict:
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, key), last.id)
+    return {"items": items, "next_cursor": next_cursor}
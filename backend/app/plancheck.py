@@ -0,0 +1,193 @@
+"""Query-plan regression check for the hot read paths.
+
+Usage: python -m app.plancheck
+
+Seeds a small synthetic dataset and ANALYZEs it, calls each hot route
+handler directly, captures the SQL it issues and runs EXPLAIN on every
+captured query with ``enable_seqscan = off``. The planner then only picks a sequential scan when
+no index can serve the query, so any Seq Scan in a plan means a hot path has
+lost its index. With sequential scans off the planner may instead walk a
+whole index and filter every row, so an index scan with a Filter but no
+Index Cond counts as a full scan too. Routes whose index matters most must
+also use it by name (EXPECTED_INDEXES). Everything runs in one transaction
+that is rolled back, but point DATABASE_URL at a migrated scratch database
+all the same.
+
+Exits with status 1 if any plan contains a full scan or misses an expected
+index.
+"""
+import asyncio
+import json
+import sys
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import event, insert, text
+
+from app import models, trends
+from app.auth import Principal
+from app.database import AsyncSessionLocal
+from app.routes import dashboard, feedback_requests, feedbacks, unassigned_employees
+
+MANAGERS = 3
+EMPLOYEES_PER_MANAGER = 10
+FEEDBACKS_PER_EMPLOYEE = 5
+# Unassigned employees that match no search. Below a few tens of thousands
+# of users the planner prefers walking a whole index to the trigram indexes.
+FILLER_EMPLOYEES = 30000
+
+# Indexes each route must use somewhere in its plans: one from every group.
+# Where several indexes lead with the same column the planner's choice
+# depends on table statistics, so any of them will do.
+EXPECTED_INDEXES = {
+    "GET /dashboard": [{"ix_feedbacks_manager_employee_created", "ix_feedbacks_manager_created"}],
+    "GET /feedbacks/employee/{id}": [{"ix_feedbacks_manager_employee_created"}],
+    "GET /unassigned-employees": [{"ix_users_name_trgm"}, {"ix_users_email_trgm"}],
+}
+
+_INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+async def _seed(db):
+    managers = [
+        {"id": uuid4(), "name": f"Manager {i}", "email": f"plancheck-m{i}@example.com", "password_hash": "x", "role": "manager"}
+        for i in range(MANAGERS)
+    ]
+    employees = [
+        {"id": uuid4(), "name": f"Employee {i}", "email": f"plancheck-e{i}@example.com", "password_hash": "x", "role": "employee"}
+        for i in range(MANAGERS * EMPLOYEES_PER_MANAGER + 2)
+    ]
+    await db.execute(insert(models.User).values(managers + employees))
+    await db.execute(
+        text(
+            "INSERT INTO users (id, name, email, password_hash, role) "
+            "SELECT gen_random_uuid(), 'Filler ' || i, 'plancheck-f' || i || '@example.com', 'x', 'employee' "
+            "FROM generate_series(1, :n) AS i"
+        ),
+        {"n": FILLER_EMPLOYEES},
+    )
+
+    teams, feedback_rows, requests = [], [], []
+    for i, employee in enumerate(employees[:-2]):
+        manager = managers[i // EMPLOYEES_PER_MANAGER]
+        teams.append({"manager_id": manager["id"], "employee_id": employee["id"]})
+        requests.append({"id": uuid4(), "manager_id": manager["id"], "employee_id": employee["id"], "status": "pending"})
+        for n in range(FEEDBACKS_PER_EMPLOYEE):
+            feedback_rows.append({
+                "id": uuid4(),
+                "manager_id": manager["id"],
+                "employee_id": employee["id"],
+                "strengths": f"Great communication on project {n}",
+                "areas_to_improve": "Estimate tasks more carefully",
+                "sentiment": ("positive", "neutral", "negative")[n % 3],
+            })
+    tag = {"id": uuid4(), "name": f"plancheck-{uuid4().hex[:8]}"}
+    await db.execute(insert(models.Team).values(teams))
+    await db.execute(insert(models.FeedbackRequest).values(requests))
+    await db.execute(insert(models.Feedback).values(feedback_rows))
+    await trends.record_feedbacks(db, [row["id"] for row in feedback_rows])
+    await db.execute(insert(models.Tag).values(tag))
+    await db.execute(insert(models.FeedbackTag).values([
+        {"feedback_id": row["id"], "tag_id": tag["id"]} for row in feedback_rows[::2]
+    ]))
+
+    manager = Principal(id=managers[0]["id"], name=managers[0]["name"], role="manager")
+    employee = Principal(id=employees[0]["id"], name=employees[0]["name"], role="employee")
+    return manager, employee, tag["name"]
+
+
+def _request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+def _hot_paths(db, manager, employee, tag_name):
+    return {
+        "GET /dashboard": lambda: dashboard.manager_dashboard(
+            request=_request("/dashboard"), latest=5, current_user=manager, db=db),
+        "GET /dashboard/trends": lambda: dashboard.sentiment_trends(
+            period="week", since=None, until=None, employee_id=None, current_user=manager, db=db),
+        "GET /feedbacks/me": lambda: feedbacks.my_feedbacks(
+            cursor=None, limit=20, current_user=employee, db=db),
+        "GET /feedbacks/employee/{id}": lambda: feedbacks.get_feedbacks_for_employee(
+            employee_id=employee.id, cursor=None, limit=20, current_user=manager, db=db),
+        "GET /feedbacks/search": lambda: feedbacks.search_feedbacks(
+            q="communication", tag=[tag_name], sentiment=None, limit=20, current_user=manager, db=db),
+        "GET /feedback-requests/notifications": lambda: feedback_requests.get_feedback_requests_for_manager(
+            cursor=None, limit=20, db=db, current_user=manager),
+        "GET /feedback-requests/my-manager": lambda: feedback_requests.get_my_manager(
+            db=db, current_user=employee),
+        "GET /unassigned-employees": lambda: unassigned_employees.get_unassigned_employees(
+            q="Emp", cursor=None, limit=20, db=db, current_user=manager),
+    }
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _full_scans(plan: dict) -> list[str]:
+    found = []
+    for node in _nodes(plan):
+        if node["Node Type"] == "Seq Scan":
+            found.append(f"seq scan on {node.get('Relation Name', '?')}")
+        elif node["Node Type"] in _INDEX_SCANS and "Filter" in node and "Index Cond" not in node:
+            found.append(f"filtered full scan of {node['Index Name']}")
+    return found
+
+
+def _indexes(plan: dict) -> set[str]:
+    return {node["Index Name"] for node in _nodes(plan) if node["Node Type"] in _INDEX_SCANS}
+
+
+async def check() -> bool:
+    ok = True
+    async with AsyncSessionLocal() as db:
+        conn = await db.connection()
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        manager, employee, tag_name = await _seed(db)
+        # Plans follow the seeded data rather than whatever statistics the
+        # database had; ANALYZE counts this transaction's own rows
+        await conn.execute(text("ANALYZE"))
+        driver = (await conn.get_raw_connection()).driver_connection
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                captured.append((statement, parameters))
+
+        event.listen(conn.sync_connection, "before_cursor_execute", capture)
+        try:
+            for name, call in _hot_paths(db, manager, employee, tag_name).items():
+                captured.clear()
+                await call()
+                statements = list(captured)
+                scans, used = [], set()
+                for statement, parameters in statements:
+                    plan = await driver.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ()))
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    scans.extend(_full_scans(plan[0]["Plan"]))
+                    used |= _indexes(plan[0]["Plan"])
+                missing = [
+                    " or ".join(sorted(group))
+                    for group in EXPECTED_INDEXES.get(name, []) if not group & used
+                ]
+                if scans:
+                    ok = False
+                    print(f"❌ {name}: {', '.join(sorted(set(scans)))}")
+                if missing:
+                    ok = False
+                    print(f"❌ {name}: not using {', '.join(missing)}")
+                if not scans and not missing:
+                    print(f"✅ {name}: {len(statements)} queries, all indexed")
+        finally:
+            event.remove(conn.sync_connection, "before_cursor_execute", capture)
+            await db.rollback()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
@@ -0,0 +1,206 @@
+"""Admission control for expensive endpoints.
+
+Each endpoint class has a rate per principal (for login, the submitted
+username) and per client IP, enforced as token buckets (GCRA: one
+"theoretical arrival time" per key), plus a cap on requests in flight in
+this worker. Over either limit the request is rejected
+with 429 and Retry-After before any expensive work starts.
+
+RATE_LIMIT_BACKEND picks where buckets live: ``memory`` (default, per
+worker, a dict lookup per check) or ``postgres`` (an UNLOGGED table shared by
+every worker, one upsert per check). Concurrency caps are always per worker.
+Any backend with an async ``take(key, rate, burst)`` can be plugged in with
+``set_backend``.
+"""
+import hashlib
+import math
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+
+from app.auth import decode_access_token
+from app.cache import LRUCache
+from app.database import get_engine
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() not in ("0", "false", "no")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_KEYS = int(os.getenv("RATE_LIMIT_KEYS", 100_000))
+# Honour X-Forwarded-For; only enable behind a proxy that sets it
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class EndpointClass:
+    name: str
+    per_minute: float      # per principal
+    ip_per_minute: float   # per client IP
+    burst: int
+    concurrency: int       # requests in flight per worker
+
+
+def _endpoint_class(name: str, per_minute: float, ip_per_minute: float, burst: int, concurrency: int) -> EndpointClass:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    return EndpointClass(
+        name=name,
+        per_minute=float(os.getenv(f"{prefix}_PER_MINUTE", per_minute)),
+        ip_per_minute=float(os.getenv(f"{prefix}_IP_PER_MINUTE", ip_per_minute)),
+        burst=int(os.getenv(f"{prefix}_BURST", burst)),
+        concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+    )
+
+
+ENDPOINT_CLASSES = {
+    # bcrypt; the principal is the submitted username, so guesses spread
+    # over many IPs are still limited per account
+    "login": _endpoint_class("login", per_minute=10, ip_per_minute=30, burst=10, concurrency=8),
+    # Queues an email per request
+    "feedback_request": _endpoint_class("feedback_request", per_minute=10, ip_per_minute=60, burst=5, concurrency=20),
+    "dashboard": _endpoint_class("dashboard", per_minute=60, ip_per_minute=300, burst=20, concurrency=10),
+}
+
+admission_stats = defaultdict(int)  # (class, reason) -> rejected requests
+
+
+class MemoryBackend:
+    """Buckets in a per-worker LRU; the least recently seen keys are dropped."""
+
+    def __init__(self, maxsize: int):
+        self._tat = LRUCache(maxsize=maxsize)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Spend one token; return 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        interval = 1.0 / rate
+        tat = max(self._tat.get(key, now), now) + interval
+        excess = tat - now - burst * interval
+        if excess > 0:
+            return excess
+        self._tat.set(key, tat)
+        return 0.0
+
+
+class PostgresBackend:
+    """Buckets in the rate_limit_buckets table, shared by every worker.
+
+    The check is a single upsert that only moves the arrival time forward
+    when the request is allowed (``excluded.tat`` is now + interval);
+    clock_timestamp() gives every worker the same clock.
+    """
+
+    _TAKE = text(
+        "WITH now AS (SELECT extract(epoch FROM clock_timestamp())::float8 AS t) "
+        "INSERT INTO rate_limit_buckets AS b (key, tat) "
+        "SELECT :key, now.t + CAST(:interval AS float8) FROM now "
+        "ON CONFLICT (key) DO UPDATE "
+        "SET tat = greatest(b.tat, excluded.tat - CAST(:interval AS float8)) + CAST(:interval AS float8) "
+        "WHERE greatest(b.tat, excluded.tat - CAST(:interval AS float8)) + CAST(:interval AS float8) "
+        "- (excluded.tat - CAST(:interval AS float8)) <= CAST(:window AS float8) "
+        "RETURNING tat"
+    )
+    _RETRY_AFTER = text(
+        "SELECT tat + CAST(:interval AS float8) - extract(epoch FROM clock_timestamp())::float8 "
+        "- CAST(:window AS float8) "
+        "FROM rate_limit_buckets WHERE key = :key"
+    )
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        params = {"key": key, "interval": 1.0 / rate, "window": burst / rate}
+        async with get_engine().begin() as conn:
+            result = await conn.execute(self._TAKE, params)
+            if result.first() is not None:
+                return 0.0
+            retry_after = (await conn.execute(self._RETRY_AFTER, params)).scalar()
+        return max(retry_after or 0.0, 0.0)
+
+
+_backend = PostgresBackend() if RATE_LIMIT_BACKEND == "postgres" else MemoryBackend(RATE_LIMIT_KEYS)
+_in_flight = defaultdict(int)
+
+
+def set_backend(backend) -> None:
+    global _backend
+    _backend = backend
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _principal_id(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token)["sub"]
+    except HTTPException:
+        # Let the route's own auth reject it
+        return None
+
+
+async def _submitted_username(request: Request) -> Optional[str]:
+    # FastAPI has already parsed the form, so this reads the cached copy.
+    # Hashed, so bucket keys (possibly in Postgres) hold no email addresses.
+    username = (await request.form()).get("username")
+    if not isinstance(username, str) or not username.strip():
+        return None
+    return hashlib.sha256(username.strip().lower().encode()).hexdigest()
+
+
+async def _principal_key(name: str, request: Request) -> Optional[str]:
+    if name == "login":
+        return await _submitted_username(request)
+    return _principal_id(request)
+
+
+def _reject(endpoint: EndpointClass, reason: str, retry_after: float):
+    admission_stats[(endpoint.name, reason)] += 1
+    raise HTTPException(
+        status_code=429,
+        detail="Too many requests, please retry later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def _take(key: str, rate_per_minute: float, burst: int) -> float:
+    if rate_per_minute <= 0:
+        return 0.0
+    return await _backend.take(key, rate_per_minute / 60, burst)
+
+
+def admission(name: str):
+    """Route dependency enforcing the limits of endpoint class ``name``."""
+    endpoint = ENDPOINT_CLASSES[name]
+
+    async def dependency(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            yield
+            return
+
+        if _in_flight[name] >= endpoint.concurrency:
+            _reject(endpoint, "concurrency", 1)
+        # Claim the slot before awaiting the buckets, so requests arriving
+        # meanwhile see it taken
+        _in_flight[name] += 1
+        try:
+            retry_after = await _take(f"{name}:ip:{client_ip(request)}", endpoint.ip_per_minute, endpoint.burst)
+            if retry_after:
+                _reject(endpoint, "ip", retry_after)
+            principal = await _principal_key(name, request)
+            if principal is not None:
+                retry_after = await _take(f"{name}:user:{principal}", endpoint.per_minute, endpoint.burst)
+                if retry_after:
+                    _reject(endpoint, "principal", retry_after)
+            yield
+        finally:
+            _in_flight[name] -= 1
+
+    return dependency
@@ -0,0 +1,82 @@
+import hashlib
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Hashable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.cache import LRUCache
+from app.serialization import dumps
+
+
+class ResponseCache:
+    """Serialized GET responses with strong ETags.
+
+    Entries are keyed by resource, scope (usually the principal), a per-scope
+    version and the query string. Write paths call ``invalidate`` which bumps
+    the version, so stale entries are never served and simply age out of the
+    LRU. Invalidation is per process; RESPONSE_CACHE_TTL bounds how long
+    another worker can serve a stale entry.
+
+    A lagging read replica could still return the pre-write rows, which
+    would then be cached under the new version. For RESPONSE_CACHE_TTL
+    after an invalidation, ``fill_session`` therefore builds entries from
+    the primary instead.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._versions: dict[tuple, int] = {}
+        self._recent_writes = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def key(self, request: Request, resource: str, scope: Optional[Hashable] = None) -> tuple:
+        # Take the key before reading from the database, so a write that
+        # lands mid-request invalidates what this request is about to store.
+        version = self._versions.get((resource, scope), 0)
+        return (resource, scope, version, request.url.query)
+
+    @asynccontextmanager
+    async def fill_session(self, key: tuple, db: AsyncSession) -> AsyncIterator[AsyncSession]:
+        """Session to build the entry for ``key`` from: ``db`` (the read
+        session) unless the scope was written to recently and a replica is
+        configured, in which case a primary session."""
+        if not database.READ_DATABASE_URL or self._recent_writes.get(key[:2]) is None:
+            yield db
+            return
+        async with database.AsyncSessionLocal() as primary:
+            yield primary
+
+    def get(self, key: tuple, request: Request) -> Optional[Response]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        etag, body = entry
+        return _respond(request, etag, body)
+
+    def set(self, key: tuple, request: Request, payload: Any) -> Response:
+        body = dumps(payload)
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._entries.set(key, (etag, body))
+        return _respond(request, etag, body)
+
+    def invalidate(self, resource: str, scope: Optional[Hashable] = None) -> None:
+        self._versions[(resource, scope)] = self._versions.get((resource, scope), 0) + 1
+        self._recent_writes.set((resource, scope), True)
+
+
+def _respond(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", 2048)),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", 60)),
+)
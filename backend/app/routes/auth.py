@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import uuid4
 
 from app import schemas, models
-from app.auth import get_current_user, hash_password
+from app.auth import Principal, get_current_user, hash_password
 from app.database import get_db
+from app.ratelimit import admission
 from fastapi.security import OAuth2PasswordRequestForm
-from app.auth import verify_password, create_access_token
+from app.auth import verify_password, create_access_token, invalidate_principal
 from datetime import timedelta
 
 
@@ -18,46 +21,95 @@ async def register_user(
     user: schemas.UserCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    # Check for existing email
-    stmt = select(models.User).where(models.User.email == user.email)
+    # Cheap existence check first, so a duplicate email never costs a bcrypt
+    # hash; ON CONFLICT below still covers a concurrent registration.
+    stmt = select(models.User.id).where(models.User.email == user.email)
+    existing = await db.execute(stmt)
+    if existing.first() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    # End the read transaction so no connection is held while hashing;
+    # only the insert below commits
+    await db.rollback()
+
+    stmt = (
+        pg_insert(models.User)
+        .values(
+            id=uuid4(),
+            name=user.name,
+            email=user.email,
+            password_hash=await hash_password(user.password),
+            role=user.role.value,
+        )
+        .on_conflict_do_nothing(index_elements=[models.User.email])
+        .returning(
+            models.User.id,
+            models.User.name,
+            models.User.email,
+            models.User.role,
+            models.User.created_at,
+        )
+    )
     result = await db.execute(stmt)
-    existing_user = result.scalar_one_or_none()
+    new_user = result.one_or_none()
 
-    if existing_user:
+    if new_user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    new_user = models.User(
-        id=uuid4(),
-        name=user.name,
-        email=user.email,
-        password_hash=hash_password(user.password),
-        role=user.role,
-    )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
     return new_user
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(admission("login"))])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(models.User).where(models.User.email == form_data.username)
+    # Plain columns rather than the entity: rollback would expire an instance
+    stmt = select(
+        models.User.id,
+        models.User.name,
+        models.User.email,
+        models.User.role,
+        models.User.password_hash,
+    ).where(models.User.email == form_data.username)
     result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = result.one_or_none()
+    # End the read transaction so no connection is held while verifying;
+    # only a rehash commits
+    await db.rollback()
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    valid, new_hash = await verify_password(form_data.password, user.password_hash)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+        )
+
+    # Transparent rehash when BCRYPT_ROUNDS has changed, in a short
+    # transaction of its own
+    if new_hash:
+        await db.execute(
+            update(models.User)
+            .where(models.User.id == user.id)
+            .values(password_hash=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        invalidate_principal(user.id)
+
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data={"sub": str(user.id), "role": user.role, "name": user.name},
         expires_delta=timedelta(minutes=60),
     )
 
@@ -74,5 +126,19 @@ async def login(
 
 
 @router.get("/me", response_model=schemas.UserOut)
-async def get_me(current_user: models.User = Depends(get_current_user)):
-    return current_user
+async def get_me(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    # The cached principal has no created_at
+    stmt = select(
+        models.User.id,
+        models.User.name,
+        models.User.email,
+        models.User.role,
+        models.User.created_at,
+    ).where(models.User.id == current_user.id)
+    user = (await db.execute(stmt)).one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
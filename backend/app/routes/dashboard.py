@@ -1,61 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException 
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from uuid import UUID
+from sqlalchemy import column, func, true, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
 from app import models, schemas
-from app.database import get_db
-from app.auth import get_current_user
+from app.database import get_read_db
+from app.auth import Principal, get_current_principal
+from app.ratelimit import admission
+from app.response_cache import response_cache
 from app import models
 
 router = APIRouter()
 
-@router.get("/dashboard", tags=["Manager"])
+@router.get("/dashboard", tags=["Manager"], dependencies=[Depends(admission("dashboard"))])
 async def manager_dashboard(
-    current_user: models.User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    latest: Optional[int] = Query(None, ge=0, le=50, description="Latest feedbacks returned per employee; all when omitted"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can access the dashboard")
 
+    key = response_cache.key(request, "dashboard", current_user.id)
+    cached = response_cache.get(key, request)
+    if cached is not None:
+        return cached
+
+    async with response_cache.fill_session(key, db) as db:
+        # Sentiment breakdown and per-employee counts in one GROUP BY;
+        # the result is at most (employees x sentiments) rows.
+        stmt = (
+            select(
+                models.Feedback.employee_id,
+                models.User.name,
+                models.Feedback.sentiment,
+                func.count().label("count"),
+            )
+            .join(models.User, models.User.id == models.Feedback.employee_id)
+            .where(models.Feedback.manager_id == current_user.id)
+            .group_by(models.Feedback.employee_id, models.User.name, models.Feedback.sentiment)
+        )
+        result = await db.execute(stmt)
+
+        sentiment_counts = {
+            "positive": 0,
+            "neutral": 0,
+            "negative": 0,
+        }
+        grouped = {}
+        for employee_id, employee_name, sentiment, count in result.all():
+            sentiment_counts[str(sentiment)] = sentiment_counts.get(str(sentiment), 0) + count
+            if employee_id not in grouped:
+                grouped[employee_id] = {
+                    "employee_id": str(employee_id),
+                    "employee_name": employee_name,
+                    "feedback_count": 0,
+                    "feedbacks": [],
+                }
+            grouped[employee_id]["feedback_count"] += count
+
+        # Latest N feedbacks per employee: one LATERAL lookup per employee,
+        # each a bounded backward walk of ix_feedbacks_manager_employee_created
+        if latest != 0 and grouped:
+            employees = values(
+                column("employee_id", PG_UUID(as_uuid=True)), name="employees"
+            ).data([(employee_id,) for employee_id in grouped])
+            newest = (
+                select(models.Feedback.id, models.Feedback.sentiment, models.Feedback.created_at)
+                .where(
+                    models.Feedback.manager_id == current_user.id,
+                    models.Feedback.employee_id == employees.c.employee_id,
+                )
+                .order_by(models.Feedback.created_at.desc(), models.Feedback.id.desc())
+                .limit(latest)
+                .lateral("newest")
+            )
+            stmt = (
+                select(employees.c.employee_id, newest.c.id, newest.c.sentiment, newest.c.created_at)
+                .select_from(employees.join(newest, true()))
+                .order_by(employees.c.employee_id, newest.c.created_at.desc(), newest.c.id.desc())
+            )
+            result = await db.execute(stmt)
+            for employee_id, fb_id, sentiment, created_at in result.all():
+                grouped[employee_id]["feedbacks"].append({
+                    "id": str(fb_id),
+                    "sentiment": sentiment,
+                    "created_at": created_at,
+                })
+
+    return response_cache.set(key, request, {
+        "sentiment_summary": sentiment_counts,
+        "team_feedback": list(grouped.values()),
+    })
+
+
+# Periods returned when ``since`` is not given
+DEFAULT_TREND_PERIODS = 12
+
+
+def _bucket_start(day: date, period: str) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+@router.get("/dashboard/trends", tags=["Manager"], response_model=schemas.SentimentTrends)
+async def sentiment_trends(
+    period: Literal["week", "month"] = "week",
+    since: Optional[date] = Query(None, description="Defaults to the last 12 periods"),
+    until: Optional[date] = None,
+    employee_id: Optional[UUID] = Query(None, description="Limit to one employee instead of the whole team"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if str(current_user.role) != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can access the dashboard")
+
+    if since is None:
+        today = datetime.now(timezone.utc).date()
+        if period == "week":
+            since = today - timedelta(weeks=DEFAULT_TREND_PERIODS - 1)
+        else:
+            months = today.year * 12 + today.month - DEFAULT_TREND_PERIODS
+            since = date(months // 12, months % 12 + 1, 1)
+
+    # Served entirely by the rollup's primary key; buckets without feedback
+    # are omitted.
+    rollup = models.FeedbackSentimentRollup
     stmt = (
-        select(models.Feedback)
-        .where(models.Feedback.manager_id == current_user.id)
-        .options(selectinload(models.Feedback.employee))
+        select(rollup.bucket, rollup.sentiment, func.sum(rollup.count))
+        .where(
+            rollup.manager_id == current_user.id,
+            rollup.period == period,
+            rollup.bucket >= _bucket_start(since, period),
+        )
+        .group_by(rollup.bucket, rollup.sentiment)
+        .order_by(rollup.bucket)
     )
+    if until is not None:
+        stmt = stmt.where(rollup.bucket <= until)
+    if employee_id is not None:
+        stmt = stmt.where(rollup.employee_id == employee_id)
     result = await db.execute(stmt)
-    feedbacks = result.scalars().all()
-
-    # Sentiment breakdown
-    sentiment_counts = {
-        "positive": 0,
-        "neutral": 0,
-        "negative": 0,
-    }
-    for fb in feedbacks:
-        sentiment_counts[str(fb.sentiment)] += 1
-
-    # Group by employee
-    grouped = {}
-    for fb in feedbacks:
-        emp = fb.employee
-        if emp.id not in grouped:
-            grouped[emp.id] = {
-                "employee_id": str(emp.id),
-                "employee_name": emp.name,
-                "feedback_count": 0,
-                "feedbacks": [],
-            }
-        grouped[emp.id]["feedback_count"] += 1
-        grouped[emp.id]["feedbacks"].append({
-            "id": str(fb.id),
-            "sentiment": fb.sentiment,
-            "created_at": fb.created_at,
-        })
-
-    return {
-        "sentiment_summary": sentiment_counts,
-        "team_feedback": list(grouped.values()),
-    }
 
+    buckets = {}
+    for bucket, sentiment, count in result.all():
+        entry = buckets.setdefault(bucket, {"bucket": bucket, "total": 0})
+        entry[sentiment] = entry.get(sentiment, 0) + count
+        entry["total"] += count
+
+    return {"period": period, "employee_id": employee_id, "buckets": list(buckets.values())}
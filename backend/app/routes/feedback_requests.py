@@ -1,39 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import uuid4
 
-from sqlalchemy.orm import selectinload
 from app import models, schemas
-from app.database import get_db
-from app.auth import get_current_user
-from app.utils import send_email
+from app.database import get_db, get_read_db
+from app.auth import (
+    STREAM_TOKEN_EXPIRE_SECONDS,
+    Principal,
+    create_stream_token,
+    get_current_principal,
+    get_current_user,
+    get_stream_principal,
+)
+from app.notifications import SSE_HEARTBEAT_SECONDS, notification_hub, notify_requests
+from app.outbox import email_worker, queue_email
+from app.ratelimit import admission
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset, page
 
 router = APIRouter(prefix="/feedback-requests", tags=["Employee"])
 
-@router.post("/", response_model=schemas.FeedbackRequestResponse)
+@router.post("/", response_model=schemas.FeedbackRequestResponse, dependencies=[Depends(admission("feedback_request"))])
 async def request_feedback(
     request: schemas.FeedbackRequestCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if str(current_user.role) != "employee":
         raise HTTPException(status_code=403, detail="Only employees can request feedback")
 
-    feedback_request = models.FeedbackRequest(
-        id=uuid4(),
-        employee_id=current_user.id,
-        manager_id=request.manager_id,
-        message=request.message
-    )
-
-    db.add(feedback_request)
-    await db.commit()
-
     # Fetch manager's email
-    stmt = select(models.User).where(models.User.id == request.manager_id)
+    stmt = select(models.User.name, models.User.email).where(models.User.id == request.manager_id)
     result = await db.execute(stmt)
-    manager = result.scalar_one_or_none()
+    manager = result.one_or_none()
+
+    stmt = (
+        insert(models.FeedbackRequest)
+        .values(
+            id=uuid4(),
+            employee_id=current_user.id,
+            manager_id=request.manager_id,
+            message=request.message,
+        )
+        .returning(*models.FeedbackRequest.__table__.c)
+    )
+    result = await db.execute(stmt)
+    feedback_request = result.one()
+    await notify_requests(db, [feedback_request])
 
     if manager:
         subject = f"📩 Feedback Request from {current_user.name}"
@@ -43,18 +60,16 @@ async def request_feedback(
             f"Message: {request.message or 'No message provided.'}\n\n"
             f"Please log in to the feedback system to respond.\n\nThanks!"
         )
-        send_email(str(manager.email), subject, body)
+        queue_email(db, str(manager.email), subject, body)
 
-    # Return created feedback request
-    stmt = select(models.FeedbackRequest).where(models.FeedbackRequest.id == feedback_request.id)
-    result = await db.execute(stmt)
-    feedback_request = result.scalar_one()
+    await db.commit()
+    email_worker.notify()
     return feedback_request
 
 @router.get("/my-manager", response_model=schemas.UserOut)
 async def get_my_manager(
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     if str(current_user.role) != "employee":
         raise HTTPException(status_code=403, detail="Only employees can view their manager")
@@ -72,10 +87,12 @@ async def get_my_manager(
     
     return manager
 
-@router.get("/notifications", response_model=list[schemas.FeedbackRequestResponse])
+@router.get("/notifications", response_model=schemas.FeedbackRequestPage)
 async def get_feedback_requests_for_manager(
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view feedback requests")
@@ -83,9 +100,46 @@ async def get_feedback_requests_for_manager(
     stmt = (
         select(models.FeedbackRequest)
         .where(models.FeedbackRequest.manager_id == current_user.id)
-        .options(selectinload(models.FeedbackRequest.employee))
-        .order_by(models.FeedbackRequest.created_at.desc())
     )
+    stmt = keyset(stmt, models.FeedbackRequest.created_at, models.FeedbackRequest.id, cursor, limit)
     result = await db.execute(stmt)
     requests = result.scalars().all()
-    return requests
\ No newline at end of file
+    return page(requests, limit)
+
+@router.post("/stream-token")
+async def issue_stream_token(current_user: Principal = Depends(get_current_principal)):
+    """Short-lived token for ``/stream?access_token=``; mint a new one before
+    an EventSource reconnects."""
+    if str(current_user.role) != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can view feedback requests")
+    return {"token": create_stream_token(current_user), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
+@router.get("/stream")
+async def stream_feedback_requests(
+    request: Request,
+    current_user: Principal = Depends(get_stream_principal)
+):
+    """Server-sent events for new feedback requests and status changes."""
+    if str(current_user.role) != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can view feedback requests")
+
+    queue = notification_hub.subscribe(current_user.id)
+
+    async def events():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: feedback_request\ndata: {payload}\n\n"
+        finally:
+            notification_hub.unsubscribe(current_user.id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
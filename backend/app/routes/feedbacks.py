@@ -1,93 +1,281 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+from collections import Counter
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import JSON, func, insert, literal_column, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import UUID, uuid4
 
 from app import models, schemas
-from app.database import get_db
-from sqlalchemy.orm import selectinload
+from app.database import ReadSessionLocal, get_db, get_read_db
 from sqlalchemy.future import select
 from fastapi import Depends
 
-from app.auth import get_current_user
+from app.auth import Principal, get_current_principal, get_current_user, get_streaming_principal
+from app.notifications import NOTIFY_COLUMNS, notify_requests
+from app.response_cache import response_cache
+from app.serialization import FastJSONResponse
+from app.tags import remember_tags, resolve_tag_ids
+from app.trends import record_feedbacks
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset, page
 
 
 
 router = APIRouter(prefix="/feedbacks", tags=["Feedbacks"],)
 
+MAX_BULK_FEEDBACKS = 200
+EXPORT_BATCH_SIZE = 1000
+
+
+# Columns of schemas.FeedbackResponse, minus the aggregated tags
+RESPONSE_COLUMNS = (
+    models.Feedback.id,
+    models.Feedback.strengths,
+    models.Feedback.areas_to_improve,
+    models.Feedback.sentiment,
+    models.Feedback.acknowledged,
+    models.Feedback.employee_reply,
+    models.Feedback.created_at,
+)
+
+
+def _with_tags(feedbacks):
+    """Select FeedbackResponse columns from ``feedbacks`` (a table, subquery or
+    CTE) with its tags aggregated into a JSON array."""
+    tags = func.coalesce(
+        func.json_agg(
+            func.json_build_object("id", models.Tag.id, "name", models.Tag.name),
+            type_=JSON,
+        ).filter(models.Tag.id.isnot(None)),
+        literal_column("'[]'::json"),
+    ).label("tags")
+    columns = [
+        feedbacks.c.id,
+        feedbacks.c.strengths,
+        feedbacks.c.areas_to_improve,
+        feedbacks.c.sentiment,
+        feedbacks.c.acknowledged,
+        feedbacks.c.employee_reply,
+        feedbacks.c.created_at,
+    ]
+    return (
+        select(*columns, tags)
+        .outerjoin(models.FeedbackTag, models.FeedbackTag.feedback_id == feedbacks.c.id)
+        .outerjoin(models.Tag, models.Tag.id == models.FeedbackTag.tag_id)
+        .group_by(*columns)
+    )
+
+
+def _feedback_page(cursor: Optional[str], limit: int, *criteria):
+    """Keyset page of FeedbackResponse rows matching ``criteria``, tags included."""
+    matches = keyset(
+        select(*RESPONSE_COLUMNS).where(*criteria),
+        models.Feedback.created_at, models.Feedback.id, cursor, limit,
+    ).subquery()
+    return _with_tags(matches).order_by(matches.c.created_at.desc(), matches.c.id.desc())
+
 # Create feedback
 @router.post("/", response_model=schemas.FeedbackResponse)
 async def create_feedback(
     feedback: schemas.FeedbackCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can create feedback")
 
-    new_feedback = models.Feedback(
-        id=uuid4(),
-        manager_id=current_user.id,
-        employee_id=feedback.employee_id,
-        strengths=feedback.strengths,
-        areas_to_improve=feedback.areas_to_improve,
-        sentiment=feedback.sentiment,
+    feedback_id = uuid4()
+    tag_ids = await resolve_tag_ids(db, feedback.tags)
+
+    stmt = (
+        insert(models.Feedback)
+        .values(
+            id=feedback_id,
+            manager_id=current_user.id,
+            employee_id=feedback.employee_id,
+            strengths=feedback.strengths,
+            areas_to_improve=feedback.areas_to_improve,
+            sentiment=feedback.sentiment,
+        )
+        .returning(models.Feedback.acknowledged, models.Feedback.created_at)
     )
+    result = await db.execute(stmt)
+    acknowledged, created_at = result.one()
+    await record_feedbacks(db, [feedback_id])
 
-    tag_objs = []
-    for tag_name in feedback.tags:
-        stmt = select(models.Tag).where(models.Tag.name == tag_name)
-        result = await db.execute(stmt)
-        tag = result.scalar_one_or_none()
-        if not tag:
-            tag = models.Tag(id=uuid4(), name=tag_name)
-            db.add(tag)
-            await db.flush()
-        tag_objs.append(tag)
+    if tag_ids:
+        await db.execute(
+            insert(models.FeedbackTag).values(
+                [{"feedback_id": feedback_id, "tag_id": tag_id} for tag_id in tag_ids.values()]
+            )
+        )
 
-    new_feedback.tags = tag_objs
+    # Fulfil every pending request from this employee (ix_feedback_requests_pending)
+    result = await db.execute(
+        update(models.FeedbackRequest)
+        .where(
+            models.FeedbackRequest.manager_id == current_user.id,
+            models.FeedbackRequest.employee_id == feedback.employee_id,
+            models.FeedbackRequest.status == "pending",
+        )
+        .values(status="fulfilled")
+        .returning(*(models.FeedbackRequest.__table__.c[name] for name in NOTIFY_COLUMNS))
+    )
+    await notify_requests(db, result.all())
 
-    db.add(new_feedback)
     await db.commit()
-    stmt = select(models.FeedbackRequest).where(
-    models.FeedbackRequest.manager_id == current_user.id,
-    models.FeedbackRequest.employee_id == feedback.employee_id,
-    models.FeedbackRequest.status == "pending"
-)
-    result = await db.execute(stmt)
-    request = result.scalar_one_or_none()
-    if request:
-        setattr(request, 'status', "fulfilled")
-        await db.commit()
-    stmt = (
-    select(models.Feedback)
-        .where(models.Feedback.id == new_feedback.id)
-        .options(selectinload(models.Feedback.tags))
+    remember_tags(tag_ids)
+    response_cache.invalidate("dashboard", current_user.id)
+
+    return {
+        "id": feedback_id,
+        "strengths": feedback.strengths,
+        "areas_to_improve": feedback.areas_to_improve,
+        "sentiment": feedback.sentiment,
+        "tags": [{"id": tag_id, "name": name} for name, tag_id in tag_ids.items()],
+        "acknowledged": acknowledged,
+        "employee_reply": None,
+        "created_at": created_at,
+    }
+
+
+# Bulk create feedback (review cycles)
+@router.post("/bulk", response_model=list[schemas.FeedbackBulkResult])
+async def create_feedbacks_bulk(
+    feedbacks: list[schemas.FeedbackCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if str(current_user.role) != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can create feedback")
+    if len(feedbacks) > MAX_BULK_FEEDBACKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_FEEDBACKS} feedbacks per request")
+
+    # Team membership, checked once for every employee in the batch
+    employee_ids = {fb.employee_id for fb in feedbacks}
+    stmt = select(models.Team.employee_id).where(
+        models.Team.manager_id == current_user.id,
+        models.Team.employee_id.in_(employee_ids),
     )
     result = await db.execute(stmt)
-    new_feedback = result.scalar_one()
-    return new_feedback
+    team = set(result.scalars().all())
+
+    results = []
+    accepted = []
+    for index, fb in enumerate(feedbacks):
+        if fb.employee_id not in team:
+            results.append(schemas.FeedbackBulkResult(
+                index=index, status="rejected", detail="Employee is not in your team"
+            ))
+            continue
+        feedback_id = uuid4()
+        accepted.append((feedback_id, fb))
+        results.append(schemas.FeedbackBulkResult(index=index, status="created", feedback_id=feedback_id))
+
+    if not accepted:
+        return results
+
+    tag_ids = await resolve_tag_ids(db, [name for _, fb in accepted for name in fb.tags])
+
+    await db.execute(
+        insert(models.Feedback).values([
+            {
+                "id": feedback_id,
+                "manager_id": current_user.id,
+                "employee_id": fb.employee_id,
+                "strengths": fb.strengths,
+                "areas_to_improve": fb.areas_to_improve,
+                "sentiment": fb.sentiment,
+            }
+            for feedback_id, fb in accepted
+        ])
+    )
+    await record_feedbacks(db, [feedback_id for feedback_id, _ in accepted])
+    feedback_tags = [
+        {"feedback_id": feedback_id, "tag_id": tag_ids[name]}
+        for feedback_id, fb in accepted
+        for name in dict.fromkeys(fb.tags)
+    ]
+    if feedback_tags:
+        await db.execute(insert(models.FeedbackTag).values(feedback_tags))
+
+    result = await db.execute(
+        update(models.FeedbackRequest)
+        .where(
+            models.FeedbackRequest.manager_id == current_user.id,
+            models.FeedbackRequest.employee_id.in_({fb.employee_id for _, fb in accepted}),
+            models.FeedbackRequest.status == "pending",
+        )
+        .values(status="fulfilled")
+        .returning(*(models.FeedbackRequest.__table__.c[name] for name in NOTIFY_COLUMNS))
+    )
+    await notify_requests(db, result.all())
+    await db.commit()
+    remember_tags(tag_ids, Counter(name for _, fb in accepted for name in dict.fromkeys(fb.tags)))
+    response_cache.invalidate("dashboard", current_user.id)
+    return results
 
 
 # Get feedbacks for employee
-@router.get("/me", response_model=list[schemas.FeedbackResponse])
+@router.get("/me", response_model=schemas.FeedbackPage)
 async def my_feedbacks(
-    current_user: models.User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     if str(current_user.role) != "employee":
         raise HTTPException(status_code=403, detail="Only employees can view this")
 
+    stmt = _feedback_page(cursor, limit, models.Feedback.employee_id == current_user.id)
+    result = await db.execute(stmt)
+    return FastJSONResponse(page(result.all(), limit))
+
+# Full-text search over feedback content
+@router.get("/search", response_model=list[schemas.FeedbackSearchResult])
+async def search_feedbacks(
+    q: str = Query(..., min_length=1),
+    tag: list[str] = Query([]),
+    sentiment: Optional[Literal["positive", "neutral", "negative"]] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Managers search what they wrote, employees what they received
+    if str(current_user.role) == "manager":
+        owner = models.Feedback.manager_id
+    else:
+        owner = models.Feedback.employee_id
+
+    query = func.websearch_to_tsquery("english", q)
+    rank = func.ts_rank(models.Feedback.search_vector, query).label("rank")
+    matches = (
+        select(*RESPONSE_COLUMNS, rank)
+        .where(owner == current_user.id, models.Feedback.search_vector.op("@@")(query))
+    )
+    if sentiment:
+        matches = matches.where(models.Feedback.sentiment == sentiment)
+    if tag:
+        tagged = (
+            select(models.FeedbackTag.feedback_id)
+            .join(models.Tag, models.Tag.id == models.FeedbackTag.tag_id)
+            .where(models.FeedbackTag.feedback_id == models.Feedback.id, models.Tag.name.in_(tag))
+        )
+        matches = matches.where(tagged.exists())
+    matches = matches.order_by(rank.desc(), models.Feedback.created_at.desc()).limit(limit).subquery()
+
     stmt = (
-        select(models.Feedback)
-        .where(models.Feedback.employee_id == current_user.id)
-        .options(selectinload(models.Feedback.tags))
-        .order_by(models.Feedback.created_at.desc())
+        _with_tags(matches)
+        .add_columns(matches.c.rank)
+        .group_by(matches.c.rank)
+        .order_by(matches.c.rank.desc(), matches.c.created_at.desc())
     )
     result = await db.execute(stmt)
-    feedbacks = result.scalars().all()
-
-    return feedbacks
+    return result.all()
 
 # Acknowledge feedback
 @router.patch("/{feedback_id}/acknowledge", response_model=schemas.FeedbackResponse)
@@ -95,53 +283,145 @@ async def acknowledge_feedback(
     feedback_id: UUID,
     data: schemas.FeedbackAcknowledgeUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if str(current_user.role) != "employee":
         raise HTTPException(status_code=403, detail="Only employees can acknowledge feedback")
 
-    stmt = select(models.Feedback).where(models.Feedback.id == feedback_id)
+    values = {"acknowledged": True}
+    if data.reply:
+        values["employee_reply"] = data.reply
+
+    # UPDATE ... RETURNING inside a CTE, so the tags come back in the same statement
+    updated = (
+        update(models.Feedback)
+        .where(
+            models.Feedback.id == feedback_id,
+            models.Feedback.employee_id == current_user.id,
+        )
+        .values(**values)
+        .returning(
+            models.Feedback.id,
+            models.Feedback.manager_id,
+            models.Feedback.strengths,
+            models.Feedback.areas_to_improve,
+            models.Feedback.sentiment,
+            models.Feedback.acknowledged,
+            models.Feedback.employee_reply,
+            models.Feedback.created_at,
+        )
+        .cte("updated")
+    )
+    stmt = _with_tags(updated).add_columns(updated.c.manager_id).group_by(updated.c.manager_id)
     result = await db.execute(stmt)
-    feedback = result.scalar_one_or_none()
+    feedback = result.one_or_none()
 
-    if not feedback or str(feedback.employee_id) != str(current_user.id):
+    if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found or unauthorized")
 
-    setattr(feedback, 'acknowledged', True)
-    if data.reply:
-        setattr(feedback, 'employee_reply', data.reply)
-
     await db.commit()
-    stmt = (
-    select(models.Feedback)
-        .where(models.Feedback.id == feedback_id)
-        .options(selectinload(models.Feedback.tags))
-    )
-    result = await db.execute(stmt)
-    feedback = result.scalar_one()
+    response_cache.invalidate("dashboard", feedback.manager_id)
     return feedback
 
-@router.get("/employee/{employee_id}", response_model=list[schemas.FeedbackResponse])
+@router.get("/employee/{employee_id}", response_model=schemas.FeedbackPage)
 async def get_feedbacks_for_employee(
     employee_id: UUID,
-    current_user: models.User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view this")
 
-    stmt = (
-        select(models.Feedback)
-        .where(
-            models.Feedback.manager_id == current_user.id,
-            models.Feedback.employee_id == employee_id,
-        )
-        .options(selectinload(models.Feedback.tags))
-        .order_by(models.Feedback.created_at.desc())
+    stmt = _feedback_page(
+        cursor, limit,
+        models.Feedback.manager_id == current_user.id,
+        models.Feedback.employee_id == employee_id,
     )
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return FastJSONResponse(page(result.all(), limit))
+
+
+EXPORT_COLUMNS = (
+    "id",
+    "manager_id",
+    "employee_id",
+    "employee_name",
+    "sentiment",
+    "strengths",
+    "areas_to_improve",
+    "acknowledged",
+    "employee_reply",
+    "created_at",
+    "tags",
+)
 
 
+async def _stream_export(stmt, format: str):
+    # No request session is involved: the export opens its own session for
+    # the server-side cursor, held only while the body is being sent.
+    async with ReadSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            if format == "csv":
+                writer = csv.writer(buffer)
+                for row in rows:
+                    writer.writerow([*row[:-1], ";".join(row.tags or [])])
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str))
+                    buffer.write("\n")
+            yield buffer.getvalue()
 
 
+@router.get("/export")
+async def export_feedbacks(
+    format: Literal["csv", "ndjson"] = "csv",
+    employee_id: Optional[UUID] = None,
+    current_user: Principal = Depends(get_streaming_principal),
+):
+    if str(current_user.role) != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can export feedback")
+
+    # Correlated subquery rather than GROUP BY, so rows can be emitted as
+    # soon as they are read instead of after a full aggregation.
+    tags = (
+        select(func.array_agg(models.Tag.name))
+        .join(models.FeedbackTag, models.FeedbackTag.tag_id == models.Tag.id)
+        .where(models.FeedbackTag.feedback_id == models.Feedback.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            models.Feedback.id,
+            models.Feedback.manager_id,
+            models.Feedback.employee_id,
+            models.User.name,
+            models.Feedback.sentiment,
+            models.Feedback.strengths,
+            models.Feedback.areas_to_improve,
+            models.Feedback.acknowledged,
+            models.Feedback.employee_reply,
+            models.Feedback.created_at,
+            tags.label("tags"),
+        )
+        .join(models.User, models.User.id == models.Feedback.employee_id)
+        .where(models.Feedback.manager_id == current_user.id)
+        .order_by(models.Feedback.created_at, models.Feedback.id)
+    )
+    if employee_id:
+        stmt = stmt.where(models.Feedback.employee_id == employee_id)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="feedback-export.{format}"'},
+    )
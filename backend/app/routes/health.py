@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.startup import database_ready, startup_stats, warm_up
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    # Liveness: the process is up and serving; no dependencies checked
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    ready = await database_ready()
+    if ready and not startup_stats["warm"]:
+        # The database was down at startup; warm the pool now that it is back
+        try:
+            await warm_up()
+        except Exception as e:
+            print("❌ Pool warm-up failed:", e)
+    body = {
+        "status": "ready" if ready and startup_stats["warm"] else "unavailable",
+        "database": ready,
+        "pool_warm": startup_stats["warm"],
+        "warm_connections": startup_stats["warm_connections"],
+    }
+    return JSONResponse(body, status_code=200 if body["status"] == "ready" else 503)
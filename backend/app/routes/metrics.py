@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database import active_engines
+from app.metrics import (
+    bcrypt_hash_seconds,
+    bcrypt_queue_seconds,
+    email_send_seconds,
+    gauge,
+    in_flight,
+    request_latency,
+)
+from app.expiry import expiry_worker
+from app.outbox import email_worker
+from app.ratelimit import admission_stats
+from app.startup import startup_stats
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _pool_samples(read):
+    # Only engines that exist; reporting must not create them
+    for name, eng in active_engines():
+        yield {"engine": name}, read(eng.sync_engine.pool)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    email = email_worker.stats
+    lines = [
+        *request_latency.render(),
+        *gauge("http_requests_in_flight", "Requests currently being served.", [({}, in_flight["requests"])]),
+        *gauge("db_pool_size", "Configured pool size.", _pool_samples(lambda pool: pool.size())),
+        *gauge("db_pool_checked_out", "Connections currently checked out.", _pool_samples(lambda pool: pool.checkedout())),
+        *gauge("db_pool_overflow", "Overflow connections currently open.", _pool_samples(lambda pool: max(0, pool.overflow()))),
+        *bcrypt_hash_seconds.render(),
+        *bcrypt_queue_seconds.render(),
+        *gauge("email_outbox_queue_depth", "Pending emails in the outbox.", [({}, email["queue_depth"])]),
+        *email_send_seconds.render(),
+        *gauge("email_sent_total", "Emails sent.", [({}, email["sent"])], "counter"),
+        *gauge("email_failed_total", "Emails that exhausted their retries.", [({}, email["failed"])], "counter"),
+        *gauge("feedback_requests_expired_total", "Pending feedback requests expired by this worker.", [({}, expiry_worker.stats["expired"])], "counter"),
+        *gauge(
+            "admission_rejected_total", "Requests rejected with 429 by admission control.",
+            [({"class": name, "reason": reason}, count) for (name, reason), count in sorted(admission_stats.items())],
+            "counter",
+        ),
+        *gauge("app_import_seconds", "Time taken to import the application.", [({}, startup_stats["import_seconds"])]),
+        *gauge("app_startup_seconds", "Time taken by startup, including pool warm-up.", [({}, startup_stats["startup_seconds"])]),
+        *gauge("db_pool_warm_connections", "Connections opened by the startup warm-up.", [({}, startup_stats["warm_connections"])]),
+    ]
+    return "\n".join(lines) + "\n"
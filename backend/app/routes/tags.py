@@ -1,29 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import uuid4
 
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.response_cache import response_cache
+from app.serialization import FastJSONResponse
+from app.tags import tag_cache, tag_index
 
 router = APIRouter(prefix="/tags", tags=["Tags"])
 
 @router.post("/", response_model=schemas.TagResponse)
 async def create_tag(tag: schemas.TagCreate, db: AsyncSession = Depends(get_db)):
+    if tag.name in tag_cache:
+        raise HTTPException(status_code=400, detail="Tag already exists")
+
     stmt = select(models.Tag).where(models.Tag.name == tag.name)
     result = await db.execute(stmt)
     existing = result.scalar_one_or_none()
 
     if existing:
+        tag_cache.set(existing.name, existing.id)
         raise HTTPException(status_code=400, detail="Tag already exists")
 
     new_tag = models.Tag(id=uuid4(), name=tag.name)
     db.add(new_tag)
     await db.commit()
     await db.refresh(new_tag)
+    tag_cache.set(new_tag.name, new_tag.id)
+    tag_index.add(new_tag.name, new_tag.id)
+    response_cache.invalidate("tags")
     return new_tag
 
 @router.get("/", response_model=list[schemas.TagResponse])
-async def list_tags(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Tag))
-    return result.scalars().all()
+async def list_tags(request: Request, db: AsyncSession = Depends(get_read_db)):
+    key = response_cache.key(request, "tags")
+    cached = response_cache.get(key, request)
+    if cached is not None:
+        return cached
+
+    async with response_cache.fill_session(key, db) as db:
+        result = await db.execute(select(models.Tag.id, models.Tag.name))
+        tags = result.all()
+    tag_cache.update((tag.name, tag.id) for tag in tags)
+    return response_cache.set(key, request, tags)
+
+@router.get("/suggest", response_model=list[schemas.TagSuggestion])
+async def suggest_tags(
+    prefix: str = "",
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Only touches the database when the index is cold or due a reload
+    await tag_index.ensure_loaded(db)
+    return FastJSONResponse(tag_index.suggest(prefix, limit))
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from app.database import get_db
 from app import models
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/teams", tags=["Teams"])
 async def assign_employee_to_manager(
     employee_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can assign employees")
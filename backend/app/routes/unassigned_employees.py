@@ -1,30 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import not_, exists
+from sqlalchemy import not_, exists, or_
 from app import models, schemas
-from app.database import get_db
-from app.auth import get_current_user
+from app.database import get_read_db
+from app.auth import Principal, get_current_principal
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, name_keyset, page
+from app.serialization import FastJSONResponse
 
 router = APIRouter(tags=["Manager"])
 
-@router.get("/unassigned-employees", response_model=list[schemas.UserOut])
+@router.get("/unassigned-employees", response_model=schemas.UserPage)
 async def get_unassigned_employees(
-    db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    q: Optional[str] = Query(None, description="Name or email prefix"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     if str(current_user.role) != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view unassigned employees")
 
-    # Query for employees who are not assigned in the teams table
-    subquery = select(models.Team.employee_id)
+    # Anti-join: employees with no row in the teams table (ix_teams_employee_id)
+    assigned = exists().where(models.Team.employee_id == models.User.id)
     stmt = (
-        select(models.User)
+        select(
+            models.User.id,
+            models.User.name,
+            models.User.email,
+            models.User.role,
+            models.User.created_at,
+        )
         .where(
             models.User.role == "employee",
-            ~models.User.id.in_(subquery)
+            not_(assigned)
         )
     )
+    if q:
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%"
+        stmt = stmt.where(or_(
+            models.User.name.ilike(pattern, escape="\\"),
+            models.User.email.ilike(pattern, escape="\\"),
+        ))
+    stmt = name_keyset(stmt, models.User.name, models.User.id, cursor, limit)
     result = await db.execute(stmt)
-    unassigned = result.scalars().all()
-    return unassigned
+    return FastJSONResponse(page(result.all(), limit, key="name"))
@@ -2,7 +2,7 @@ from typing import Literal, Optional
 from pydantic import BaseModel, EmailStr
 from enum import Enum
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 
 class RoleEnum(str, Enum):
     manager = "manager"
@@ -24,6 +24,10 @@ class UserOut(BaseModel):
     class Config:
         orm_mode = True
 
+class UserPage(BaseModel):
+    items: list[UserOut]
+    next_cursor: Optional[str] = None
+
 class TagBase(BaseModel):
     name: str
 
@@ -36,6 +40,9 @@ class TagResponse(TagBase):
     class Config:
         orm_mode = True
 
+class TagSuggestion(TagResponse):
+    uses: int
+
 class FeedbackCreate(BaseModel):
     employee_id: UUID
     strengths: str
@@ -57,6 +64,19 @@ class FeedbackResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class FeedbackSearchResult(FeedbackResponse):
+    rank: float
+
+class FeedbackBulkResult(BaseModel):
+    index: int
+    status: Literal["created", "rejected"]
+    feedback_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+class FeedbackPage(BaseModel):
+    items: list[FeedbackResponse]
+    next_cursor: Optional[str] = None
+
 
 class SentimentBreakdown(BaseModel):
     positive: int = 0
@@ -69,6 +89,15 @@ class EmployeeFeedbackSummary(BaseModel):
     feedback_count: int
     sentiments: SentimentBreakdown
 
+class SentimentTrendBucket(SentimentBreakdown):
+    bucket: date
+    total: int = 0
+
+class SentimentTrends(BaseModel):
+    period: Literal["week", "month"]
+    employee_id: Optional[UUID] = None
+    buckets: list[SentimentTrendBucket]
+
 class FeedbackAcknowledgeUpdate(BaseModel):
     reply: Optional[str] = None
 
@@ -87,3 +116,7 @@ class FeedbackRequestResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class FeedbackRequestPage(BaseModel):
+    items: list[FeedbackRequestResponse]
+    next_cursor: Optional[str] = None
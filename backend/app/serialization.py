@@ -0,0 +1,42 @@
+"""JSON encoding for read endpoints that return rows from lean selects.
+
+Rows go straight to bytes without jsonable_encoder or response_model
+validation; the route's response_model still documents the shape. orjson is
+used when it is installed, otherwise the stdlib encoder with the same type
+handling.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    # SQLAlchemy Row
+    if hasattr(value, "_mapping"):
+        return dict(value._mapping)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,114 @@
+"""Connection pool warm-up and cold-start timings.
+
+With DB_POOL_WARM=N, startup opens N connections on each engine (capped at
+DB_POOL_SIZE) and, unless DB_WARM_STATEMENTS is off, runs the hot read
+queries on each of them once, so asyncpg has them prepared before the first
+request arrives. DB_POOL_WARM=0 skips the database entirely at startup,
+which suits serverless deployments where every cold start counts.
+"""
+import asyncio
+import os
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from app import models
+from app.database import get_engine, get_read_engine
+from app.pagination import DEFAULT_PAGE_SIZE, keyset
+
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", 1))
+DB_WARM_STATEMENTS = os.getenv("DB_WARM_STATEMENTS", "true").lower() not in ("0", "false", "no")
+DB_READY_TIMEOUT = float(os.getenv("DB_READY_TIMEOUT", 2))
+
+# Matches no row; only the statement text matters for preparing it
+_NIL = UUID(int=0)
+
+startup_stats = {
+    "import_seconds": 0.0,
+    "startup_seconds": 0.0,
+    "warm_connections": 0,
+    "warm": False,
+}
+
+
+def _primary_statements():
+    # load_user, behind every authenticated write
+    return [select(models.User).where(models.User.id == _NIL)]
+
+
+def _read_statements():
+    from app.routes.feedbacks import _feedback_page
+
+    return [
+        _feedback_page(None, DEFAULT_PAGE_SIZE, models.Feedback.employee_id == _NIL),
+        _feedback_page(
+            None, DEFAULT_PAGE_SIZE,
+            models.Feedback.manager_id == _NIL,
+            models.Feedback.employee_id == _NIL,
+        ),
+        keyset(
+            select(models.FeedbackRequest).where(models.FeedbackRequest.manager_id == _NIL),
+            models.FeedbackRequest.created_at, models.FeedbackRequest.id, None, DEFAULT_PAGE_SIZE,
+        ),
+    ]
+
+
+async def _warm_engine(engine, statements) -> int:
+    count = min(DB_POOL_WARM, engine.sync_engine.pool.size())
+    # Hold every connection at once, otherwise the pool hands the same one out again
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+    try:
+        # Raise only once the connections that did open are queued for closing
+        for conn in opened:
+            if isinstance(conn, BaseException):
+                raise conn
+        for conn in connections:
+            await conn.execute(text("SELECT 1"))
+            if DB_WARM_STATEMENTS:
+                for stmt in statements:
+                    await conn.execute(stmt)
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+    return count
+
+
+async def warm_up() -> None:
+    """Pre-open pool connections and prepare hot statements."""
+    if DB_POOL_WARM <= 0:
+        startup_stats["warm"] = True
+        return
+    primary, replica = get_engine(), get_read_engine()
+    if replica is primary:
+        warmed = await _warm_engine(primary, _primary_statements() + _read_statements())
+    else:
+        warmed = await _warm_engine(primary, _primary_statements())
+        warmed += await _warm_engine(replica, _read_statements())
+    startup_stats["warm_connections"] = warmed
+    startup_stats["warm"] = True
+
+
+async def _ping_engine(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _ping():
+    primary, replica = get_engine(), get_read_engine()
+    if replica is primary:
+        await _ping_engine(primary)
+    else:
+        # Reads go to the replica, so the app is not ready without it either
+        await asyncio.gather(_ping_engine(primary), _ping_engine(replica))
+
+
+async def database_ready() -> bool:
+    try:
+        await asyncio.wait_for(_ping(), timeout=DB_READY_TIMEOUT)
+        return True
+    except Exception as e:
+        print("❌ Readiness check failed:", e)
+        return False
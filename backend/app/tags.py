@@ -0,0 +1,168 @@
+import asyncio
+import bisect
+import heapq
+import os
+import time
+from collections import Counter
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import models
+from app.cache import LRUCache
+from app.database import ReadSessionLocal
+from app.response_cache import response_cache
+
+# Tag name -> id, shared by /tags and create_feedback. Only populated with
+# committed tags so a rolled-back insert can never leave a dangling id behind.
+tag_cache = LRUCache(maxsize=int(os.getenv("TAG_CACHE_SIZE", 4096)))
+# Seconds before the suggest index is reloaded, to pick up tags and usage
+# recorded by other workers
+TAG_INDEX_TTL = float(os.getenv("TAG_INDEX_TTL", 300))
+
+
+async def resolve_tag_ids(db: AsyncSession, names: list[str]) -> dict[str, UUID]:
+    """Map tag names to ids, creating the missing ones.
+
+    Cached names cost nothing; the rest are resolved with a single
+    INSERT ... ON CONFLICT DO NOTHING RETURNING unioned with a lookup of the
+    existing rows. A second lookup only happens when a concurrent writer
+    created one of the tags after this statement's snapshot was taken.
+    Call ``remember_tags`` once the transaction has committed.
+    """
+    resolved = {}
+    missing = []
+    for name in dict.fromkeys(names):
+        tag_id = tag_cache.get(name)
+        if tag_id is None:
+            missing.append(name)
+        else:
+            resolved[name] = tag_id
+
+    if not missing:
+        return resolved
+
+    inserted = (
+        pg_insert(models.Tag)
+        # Sorted, so concurrent inserts of the same new tags take their
+        # unique-index entries in one order and cannot deadlock
+        .values([{"id": uuid4(), "name": name} for name in sorted(missing)])
+        .on_conflict_do_nothing(index_elements=[models.Tag.name])
+        .returning(models.Tag.id, models.Tag.name)
+        .cte("inserted")
+    )
+    stmt = select(inserted.c.id, inserted.c.name).union_all(
+        select(models.Tag.id, models.Tag.name).where(models.Tag.name.in_(missing))
+    )
+    result = await db.execute(stmt)
+    resolved.update({name: tag_id for tag_id, name in result.all()})
+
+    raced = [name for name in missing if name not in resolved]
+    if raced:
+        stmt = select(models.Tag.id, models.Tag.name).where(models.Tag.name.in_(raced))
+        result = await db.execute(stmt)
+        resolved.update({name: tag_id for tag_id, name in result.all()})
+
+    return resolved
+
+
+def remember_tags(tags: dict[str, UUID], uses: Optional[Counter] = None) -> None:
+    """Record committed tags; ``uses`` counts new feedbacks per tag name
+    (default: one each)."""
+    # Names we have not seen yet may be new tags, so the cached /tags list
+    # can no longer be trusted.
+    if any(name not in tag_cache for name in tags):
+        response_cache.invalidate("tags")
+    tag_cache.update(tags.items())
+    for name, tag_id in tags.items():
+        tag_index.add(name, tag_id, uses[name] if uses is not None else 1)
+
+
+class TagIndex:
+    """Case-insensitive prefix index of tag names, ranked by usage.
+
+    Tag names are kept in a sorted list so the names matching a prefix are a
+    contiguous slice found by bisect. Loaded from the database on first use;
+    after TAG_INDEX_TTL seconds a background task reloads it while the old
+    index keeps being served. In between, writes in this worker update it in
+    place, so suggestions never wait on the database once loaded.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._keys: list[tuple[str, str]] = []  # (lowercase name, name), sorted
+        self._tags: dict[str, tuple[UUID, int]] = {}  # name -> (id, uses)
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+        # add() calls made while a load is running, replayed onto its result
+        self._pending: Optional[list[tuple[str, UUID, int]]] = None
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self._loaded_at is None:
+            async with self._lock:
+                if self._loaded_at is None:
+                    await self._load(db)
+        elif time.monotonic() - self._loaded_at >= self.ttl and self._refresh is None:
+            self._refresh = asyncio.create_task(self._reload())
+
+    async def _reload(self) -> None:
+        try:
+            # The request's session is gone by the time this runs
+            async with ReadSessionLocal() as db:
+                await self._load(db)
+        except Exception as e:
+            print("❌ Tag index reload failed:", e)
+        finally:
+            self._refresh = None
+
+    async def _load(self, db: AsyncSession) -> None:
+        stmt = (
+            select(models.Tag.id, models.Tag.name, func.count(models.FeedbackTag.feedback_id))
+            .outerjoin(models.FeedbackTag, models.FeedbackTag.tag_id == models.Tag.id)
+            .group_by(models.Tag.id, models.Tag.name)
+        )
+        # Uses committed between starting the query and its snapshot are
+        # counted twice; the next reload corrects that
+        self._pending = []
+        try:
+            result = await db.execute(stmt)
+            tags = {name: (tag_id, uses) for tag_id, name, uses in result.all()}
+            for name, tag_id, uses in self._pending:
+                _count_uses(tags, name, tag_id, uses)
+        finally:
+            self._pending = None
+        self._tags = tags
+        self._keys = sorted((name.lower(), name) for name in tags)
+        self._loaded_at = time.monotonic()
+
+    def add(self, name: str, tag_id: UUID, uses: int = 0) -> None:
+        if self._pending is not None:
+            self._pending.append((name, tag_id, uses))
+        # Until the first load there is nothing to update
+        if self._loaded_at is None:
+            return
+        if name not in self._tags:
+            bisect.insort(self._keys, (name.lower(), name))
+        _count_uses(self._tags, name, tag_id, uses)
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, (prefix, ""))
+        # The highest code point sorts after anything that can follow the prefix
+        end = bisect.bisect_left(self._keys, (prefix + "\U0010ffff", ""), lo=start)
+        matches = (name for _, name in self._keys[start:end])
+        best = heapq.nsmallest(limit, matches, key=lambda name: (-self._tags[name][1], name.lower()))
+        return [{"id": self._tags[name][0], "name": name, "uses": self._tags[name][1]} for name in best]
+
+
+def _count_uses(tags: dict[str, tuple[UUID, int]], name: str, tag_id: UUID, uses: int) -> None:
+    current = tags.get(name)
+    tags[name] = (tag_id, uses) if current is None else (current[0], current[1] + uses)
+
+
+tag_index = TagIndex(ttl=TAG_INDEX_TTL)
@@ -0,0 +1,87 @@
+"""Sentiment trend rollup behind /dashboard/trends.
+
+feedback_sentiment_rollups holds feedback counts per (manager, week or month,
+employee, sentiment). ``record_feedbacks`` adds new feedback to it in the
+writer's transaction, so the rollup never drifts from feedbacks and trend
+queries cost the same regardless of history size. Buckets are UTC calendar
+weeks (starting Monday) and months.
+
+Usage: python -m app.trends   # rebuild the rollup from feedbacks
+"""
+import asyncio
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Date, String, cast, column, delete, func, literal_column, text, true, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import models
+from app.database import AsyncSessionLocal
+
+PERIODS = ("week", "month")
+
+Rollup = models.FeedbackSentimentRollup
+_COLUMNS = ["manager_id", "employee_id", "period", "bucket", "sentiment", "count"]
+
+
+def _rollup_select():
+    periods = values(column("period", String), name="periods").data([(period,) for period in PERIODS])
+    bucket = cast(
+        func.date_trunc(periods.c.period, func.timezone(literal_column("'UTC'"), models.Feedback.created_at)),
+        Date,
+    )
+    return (
+        select(
+            models.Feedback.manager_id,
+            models.Feedback.employee_id,
+            periods.c.period,
+            bucket,
+            models.Feedback.sentiment,
+            func.count(),
+        )
+        .select_from(models.Feedback)
+        .join(periods, true())
+        .group_by(
+            models.Feedback.manager_id,
+            models.Feedback.employee_id,
+            periods.c.period,
+            bucket,
+            models.Feedback.sentiment,
+        )
+    )
+
+
+async def record_feedbacks(db: AsyncSession, feedback_ids: Iterable[UUID]) -> None:
+    """Add just-inserted feedbacks to the rollup, in one statement.
+
+    Call it in the transaction that inserted them, after the insert.
+    """
+    feedback_ids = list(feedback_ids)
+    if not feedback_ids:
+        return
+    stmt = pg_insert(Rollup).from_select(
+        _COLUMNS, _rollup_select().where(models.Feedback.id.in_(feedback_ids))
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Rollup.manager_id, Rollup.period, Rollup.bucket, Rollup.employee_id, Rollup.sentiment],
+        set_={"count": Rollup.count + stmt.excluded["count"]},
+    )
+    await db.execute(stmt)
+
+
+async def rebuild() -> None:
+    """Recompute the whole rollup from feedbacks."""
+    async with AsyncSessionLocal() as db:
+        # Writers block on the rollup until we commit, so feedback inserted
+        # meanwhile is counted exactly once: by us or by its own increment.
+        await db.execute(text("LOCK TABLE feedback_sentiment_rollups IN EXCLUSIVE MODE"))
+        await db.execute(delete(Rollup))
+        await db.execute(pg_insert(Rollup).from_select(_COLUMNS, _rollup_select()))
+        await db.commit()
+    print("✅ Rebuilt feedback sentiment rollup")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -1,34 +1,19 @@
-from passlib.context import CryptContext
-import smtplib
 from email.message import EmailMessage
 import os
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
+SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER)
+# Disable for local SMTP stand-ins (e.g. `python -m aiosmtpd -n -l localhost:1025`)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() not in ("0", "false", "no")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
 
-def send_email(to_email: str, subject: str, body: str):
+def build_email(to_email: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subject
-    msg["From"] = SMTP_USER
+    msg["From"] = SMTP_FROM
     msg["To"] = to_email
     msg.set_content(body)
-
-    try:
-        if SMTP_USER is None or SMTP_PASS is None:
-            raise ValueError("SMTP_USER and SMTP_PASS environment variables must be set")
-        
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as smtp:
-            smtp.starttls()
-            smtp.login(SMTP_USER, SMTP_PASS)
-            smtp.send_message(msg)
-            print(f"📧 Email sent to {to_email}")
-    except Exception as e:
-        print("❌ Email send failed:", e)
+    return msg
@@ -0,0 +1,244 @@
+"""Concurrent load benchmark for the main API paths.
+
+Usage:
+    python -m bench.run --base-url http://127.0.0.1:8000 --duration 60 --concurrency 50 \
+        --out bench/results/run.json [--compare bench/results/baseline.json]
+
+Drives /auth/login, /dashboard, /feedbacks/me, POST /feedbacks/ and
+/feedback-requests/notifications against a server seeded with bench.seed
+(pass the same --managers/--employees-per-manager/--password). Records
+throughput and p50/p95/p99 latency per scenario to a JSON file; with
+--compare, prints the change against an earlier run. Start the server with
+RATE_LIMIT_ENABLED=false, or admission control will throttle the run.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from bench.seed import employee_email, manager_email
+
+# Relative frequency of each scenario
+SCENARIOS = {
+    "POST /auth/login": 1,
+    "GET /dashboard": 4,
+    "GET /feedbacks/me": 4,
+    "POST /feedbacks/": 1,
+    "GET /feedback-requests/notifications": 2,
+}
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client, enough for JSON APIs."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers: dict = None) -> tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self._writer.drain()
+
+        status = int((await self._reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).strip(), 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self._reader.readexactly(int(response_headers.get("content-length", 0)))
+
+        if response_headers.get("connection") == "close":
+            await self.close()
+        return status, payload
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class Bench:
+    def __init__(self, args):
+        self.args = args
+        url = urlsplit(args.base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.rng = random.Random(args.seed)
+        self.latencies = {name: [] for name in SCENARIOS}
+        self.errors = {name: 0 for name in SCENARIOS}
+        self.managers = {}   # manager index -> token
+        self.employees = []  # (token, employee id, manager index)
+
+    async def login(self, conn, email: str):
+        body = urlencode({"username": email, "password": self.args.password}).encode()
+        return await conn.request(
+            "POST", "/auth/login", body, {"Content-Type": "application/x-www-form-urlencoded"}
+        )
+
+    async def setup(self):
+        conn = HTTPConnection(self.host, self.port)
+        employee_total = self.args.managers * self.args.employees_per_manager
+        sample = self.rng.sample(range(employee_total), min(self.args.users, employee_total))
+        # Log in the managers of the sampled employees, so POST /feedbacks/
+        # always has a manager token for the target employee's team
+        for manager_index in dict.fromkeys(i // self.args.employees_per_manager for i in sample):
+            status, payload = await self.login(conn, manager_email(manager_index))
+            if status != 200:
+                raise SystemExit(f"Login failed for {manager_email(manager_index)} ({status}); was the database seeded?")
+            self.managers[manager_index] = json.loads(payload)["access_token"]
+        for i in sample:
+            status, payload = await self.login(conn, employee_email(i))
+            if status != 200:
+                raise SystemExit(f"Login failed for {employee_email(i)} ({status})")
+            data = json.loads(payload)
+            self.employees.append((data["access_token"], data["user"]["id"], i // self.args.employees_per_manager))
+        await conn.close()
+
+    async def run_scenario(self, conn, name: str) -> int:
+        if name == "POST /auth/login":
+            i = self.rng.randrange(self.args.managers)
+            return (await self.login(conn, manager_email(i)))[0]
+        if name == "GET /feedbacks/me":
+            token, _, _ = self.rng.choice(self.employees)
+            return (await conn.request("GET", "/feedbacks/me", headers=_auth(token)))[0]
+        if name == "POST /feedbacks/":
+            _, employee_id, manager_index = self.rng.choice(self.employees)
+            token = self.managers[manager_index]
+            body = json.dumps({
+                "employee_id": employee_id,
+                "strengths": "Solid delivery this sprint",
+                "areas_to_improve": "Share progress earlier",
+                "sentiment": self.rng.choice(("positive", "neutral", "negative")),
+                "tags": self.rng.sample([f"bench-tag-{n}" for n in range(10)], 2),
+            }).encode()
+            headers = {**_auth(token), "Content-Type": "application/json"}
+            return (await conn.request("POST", "/feedbacks/", body, headers))[0]
+        token = self.rng.choice(list(self.managers.values()))
+        path = name.split(" ", 1)[1]
+        return (await conn.request("GET", path, headers=_auth(token)))[0]
+
+    async def worker(self, deadline: float):
+        conn = HTTPConnection(self.host, self.port)
+        names, weights = list(SCENARIOS), list(SCENARIOS.values())
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = await self.run_scenario(conn, name)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                await conn.close()
+                status = 0
+            self.latencies[name].append(time.perf_counter() - started)
+            if status >= 400 or status == 0:
+                self.errors[name] += 1
+        await conn.close()
+
+    async def run(self) -> dict:
+        await self.setup()
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(self.args.concurrency)))
+        elapsed = time.perf_counter() - started
+        return {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "base_url": self.args.base_url,
+                "duration_seconds": round(elapsed, 2),
+                "concurrency": self.args.concurrency,
+                "managers": self.args.managers,
+                "employees_per_manager": self.args.employees_per_manager,
+                "python": platform.python_version(),
+            },
+            "scenarios": {
+                name: _summarize(samples, self.errors[name], elapsed)
+                for name, samples in self.latencies.items()
+            },
+        }
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"{'scenario':40} {'metric':15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, stats in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = before[metric], stats[metric]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:40} {metric:15} {old:>10} {new:>10} {change:>8}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=100, help="managers and employees to log in as")
+    parser.add_argument("--managers", type=int, default=1000)
+    parser.add_argument("--employees-per-manager", type=int, default=10)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench/results/latest.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(Bench(args).run())
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    print(json.dumps(result["scenarios"], indent=2))
+    print(f"Results written to {out}")
+    if args.compare:
+        compare(result, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
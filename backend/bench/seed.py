@@ -0,0 +1,167 @@
+"""Synthetic data generator for benchmarks.
+
+Usage: python -m bench.seed --managers 1000 --employees-per-manager 10 --feedbacks 1000000
+
+Loads users, teams, tags, feedbacks, feedback_tags and feedback requests with
+COPY in fixed-size batches, so memory stays flat at any scale. Every user
+gets the same password (--password) and a predictable email
+(bench-m{i}@example.com for managers, bench-e{i}@example.com for
+employees), which is what bench.run logs in with. Employee i reports to
+manager i // employees-per-manager. Run against a migrated, empty database.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+from app.auth import pwd_context
+from app.database import database_url, driver_dsn
+from app.trends import rebuild
+
+BATCH_SIZE = 50_000
+SENTIMENTS = ("positive", "neutral", "negative")
+PHRASES = (
+    "clear communication", "ownership of the release", "code review quality",
+    "mentoring new joiners", "estimating work", "documentation", "on-call handling",
+    "stakeholder updates", "test coverage", "meeting deadlines",
+)
+FEEDBACK_COLUMNS = (
+    "id", "manager_id", "employee_id", "strengths", "areas_to_improve",
+    "sentiment", "created_at", "acknowledged", "employee_reply",
+)
+
+
+def manager_email(i: int) -> str:
+    return f"bench-m{i}@example.com"
+
+
+def employee_email(i: int) -> str:
+    return f"bench-e{i}@example.com"
+
+
+async def _copy(conn, table: str, columns: tuple, records) -> int:
+    total = 0
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            total += len(batch)
+            batch = []
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    return total
+
+
+async def seed(args):
+    rng = random.Random(args.seed)
+    password_hash = pwd_context.hash(args.password)
+    now = datetime.now(timezone.utc)
+    history = timedelta(days=args.history_days)
+
+    manager_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(args.managers)]
+    employee_count = args.managers * args.employees_per_manager
+    employee_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(employee_count)]
+    tag_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(args.tags)]
+
+    def users():
+        for i, user_id in enumerate(manager_ids):
+            yield (user_id, f"Manager {i}", manager_email(i), password_hash, "manager", now - history)
+        for i, user_id in enumerate(employee_ids):
+            yield (user_id, f"Employee {i}", employee_email(i), password_hash, "employee", now - history)
+
+    def teams():
+        for i, employee_id in enumerate(employee_ids):
+            yield (manager_ids[i // args.employees_per_manager], employee_id)
+
+    def feedbacks_and_tags():
+        for _ in range(args.feedbacks):
+            i = rng.randrange(employee_count)
+            feedback_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            feedback = (
+                feedback_id,
+                manager_ids[i // args.employees_per_manager],
+                employee_ids[i],
+                f"Strong {rng.choice(PHRASES)} and {rng.choice(PHRASES)}.",
+                f"Could improve {rng.choice(PHRASES)}.",
+                rng.choice(SENTIMENTS),
+                now - history * rng.random(),
+                rng.random() < 0.5,
+                None,
+            )
+            tags = [(feedback_id, tag_id) for tag_id in rng.sample(tag_ids, k=min(rng.randint(0, 3), len(tag_ids)))]
+            yield feedback, tags
+
+    def requests():
+        for _ in range(args.requests):
+            i = rng.randrange(employee_count)
+            yield (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                employee_ids[i],
+                manager_ids[i // args.employees_per_manager],
+                "Could I get feedback on my last sprint?",
+                rng.choice(("pending", "fulfilled")),
+                now - history * rng.random(),
+            )
+
+    conn = await asyncpg.connect(driver_dsn(database_url()))
+    started = time.perf_counter()
+    try:
+        async with conn.transaction():
+            count = await _copy(conn, "users", ("id", "name", "email", "password_hash", "role", "created_at"), users())
+            print(f"users: {count}")
+            count = await _copy(conn, "teams", ("manager_id", "employee_id"), teams())
+            print(f"teams: {count}")
+            count = await _copy(conn, "tags", ("id", "name"), ((tag_id, f"bench-tag-{i}") for i, tag_id in enumerate(tag_ids)))
+            print(f"tags: {count}")
+
+            # feedbacks and their tags come from one stream; buffer the tag
+            # rows per batch so both tables are loaded in step
+            feedback_batch, tag_batch, feedback_total, tag_total = [], [], 0, 0
+            for feedback, tags in feedbacks_and_tags():
+                feedback_batch.append(feedback)
+                tag_batch.extend(tags)
+                if len(feedback_batch) >= BATCH_SIZE:
+                    feedback_total += await _copy(conn, "feedbacks", FEEDBACK_COLUMNS, feedback_batch)
+                    tag_total += await _copy(conn, "feedback_tags", ("feedback_id", "tag_id"), tag_batch)
+                    feedback_batch, tag_batch = [], []
+            feedback_total += await _copy(conn, "feedbacks", FEEDBACK_COLUMNS, feedback_batch)
+            tag_total += await _copy(conn, "feedback_tags", ("feedback_id", "tag_id"), tag_batch)
+            print(f"feedbacks: {feedback_total}, feedback_tags: {tag_total}")
+
+            count = await _copy(
+                conn, "feedback_requests",
+                ("id", "employee_id", "manager_id", "message", "status", "created_at"),
+                requests(),
+            )
+            print(f"feedback_requests: {count}")
+
+        await conn.execute("ANALYZE users, teams, tags, feedbacks, feedback_tags, feedback_requests")
+    finally:
+        await conn.close()
+    # COPY bypasses the incremental rollup maintained by create_feedback
+    await rebuild()
+    print(f"✅ Seeded in {time.perf_counter() - started:.1f}s")
+
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--managers", type=int, default=1000)
+    parser.add_argument("--employees-per-manager", type=int, default=10)
+    parser.add_argument("--feedbacks", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--history-days", type=int, default=3 * 365)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible data")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(seed(parse_args()))
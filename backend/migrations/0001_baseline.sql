@@ -0,0 +1,51 @@
+-- Schema as it existed before migrations were introduced. Every statement is
+-- idempotent so this can be applied to databases created by hand.
+
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    email VARCHAR NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    role VARCHAR NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    CONSTRAINT check_role_valid CHECK (role IN ('manager', 'employee'))
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    id UUID PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS feedbacks (
+    id UUID PRIMARY KEY,
+    manager_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    employee_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    strengths TEXT NOT NULL,
+    areas_to_improve TEXT NOT NULL,
+    sentiment VARCHAR NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    acknowledged BOOLEAN,
+    employee_reply TEXT
+);
+
+CREATE TABLE IF NOT EXISTS feedback_tags (
+    feedback_id UUID REFERENCES feedbacks (id) ON DELETE CASCADE,
+    tag_id UUID REFERENCES tags (id) ON DELETE CASCADE,
+    PRIMARY KEY (feedback_id, tag_id)
+);
+
+CREATE TABLE IF NOT EXISTS feedback_requests (
+    id UUID PRIMARY KEY,
+    employee_id UUID NOT NULL REFERENCES users (id),
+    manager_id UUID NOT NULL REFERENCES users (id),
+    message VARCHAR,
+    status VARCHAR,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    manager_id UUID REFERENCES users (id),
+    employee_id UUID REFERENCES users (id),
+    PRIMARY KEY (manager_id, employee_id),
+    CONSTRAINT check_manager_employee_different CHECK (manager_id != employee_id)
+);
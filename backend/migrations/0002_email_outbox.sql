@@ -0,0 +1,15 @@
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id UUID PRIMARY KEY,
+    to_email VARCHAR NOT NULL,
+    subject VARCHAR NOT NULL,
+    body TEXT NOT NULL,
+    status VARCHAR NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    next_attempt_at TIMESTAMPTZ DEFAULT now(),
+    created_at TIMESTAMPTZ DEFAULT now(),
+    sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_email_outbox_pending
+    ON email_outbox (next_attempt_at) WHERE status = 'pending';
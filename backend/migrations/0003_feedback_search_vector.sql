@@ -0,0 +1,6 @@
+-- Adding a stored generated column rewrites feedbacks under an ACCESS
+-- EXCLUSIVE lock; schedule it outside peak hours on large tables.
+ALTER TABLE feedbacks ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        to_tsvector('english', coalesce(strengths, '') || ' ' || coalesce(areas_to_improve, ''))
+    ) STORED;
@@ -0,0 +1,21 @@
+-- migrate: no-transaction
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction, so each
+-- statement is executed on its own. If one fails it leaves an INVALID index
+-- behind: drop it and re-run the migration.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_role_name ON users (role, name, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedbacks_employee_created ON feedbacks (employee_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedbacks_manager_employee_created ON feedbacks (manager_id, employee_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedbacks_manager_created ON feedbacks (manager_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedbacks_created_at ON feedbacks (created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedbacks_search_vector ON feedbacks USING gin (search_vector);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_requests_manager_created ON feedback_requests (manager_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_requests_manager_status ON feedback_requests (manager_id, status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_teams_employee_id ON teams (employee_id);
@@ -0,0 +1,18 @@
+CREATE TABLE IF NOT EXISTS feedback_sentiment_rollups (
+    manager_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    period VARCHAR NOT NULL,
+    bucket DATE NOT NULL,
+    employee_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    sentiment VARCHAR NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (manager_id, period, bucket, employee_id, sentiment)
+);
+
+-- Backfill from existing feedback; same query as app.trends.rebuild
+INSERT INTO feedback_sentiment_rollups (manager_id, employee_id, period, bucket, sentiment, count)
+SELECT f.manager_id, f.employee_id, p.period,
+       date_trunc(p.period, timezone('UTC', f.created_at))::date,
+       f.sentiment, count(*)
+FROM feedbacks f CROSS JOIN (VALUES ('week'), ('month')) AS p (period)
+GROUP BY 1, 2, 3, 4, 5
+ON CONFLICT DO NOTHING;
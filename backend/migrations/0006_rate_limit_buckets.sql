@@ -0,0 +1,4 @@
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+    key VARCHAR PRIMARY KEY,
+    tat DOUBLE PRECISION NOT NULL
+);
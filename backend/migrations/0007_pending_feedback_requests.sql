@@ -0,0 +1,7 @@
+-- migrate: no-transaction
+-- See 0004 for what to do if a CONCURRENTLY build fails.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_requests_pending
+    ON feedback_requests (manager_id, employee_id) WHERE status = 'pending';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_requests_pending_created
+    ON feedback_requests (created_at) WHERE status = 'pending';
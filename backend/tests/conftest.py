@@ -0,0 +1,84 @@
+"""Integration test setup.
+
+The tests run the app against a real, disposable Postgres database given by
+TEST_DATABASE_URL; migrations are applied to it first. Without it the tests
+are skipped. Install requirements-dev.txt to run them.
+"""
+import asyncio
+import os
+import re
+import uuid
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ["READ_DATABASE_URL"] = ""
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["EMAIL_WORKER_ENABLED"] = "false"
+    os.environ["EXPIRY_WORKER_ENABLED"] = "false"
+    os.environ["DB_POOL_WARM"] = "0"
+
+
+@pytest.fixture(scope="session")
+def client():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.migrate import migrate
+
+    asyncio.run(migrate())
+    with TestClient(app) as client:
+        yield client
+
+
+def statement_count(response) -> int:
+    """Statements the request issued, from the Server-Timing header."""
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+def give_feedback(client, manager: dict, employee: dict, **fields) -> dict:
+    """Create a feedback from ``manager`` to ``employee``; returns the response body."""
+    body = {
+        "employee_id": employee["id"],
+        "strengths": "Clear communication",
+        "areas_to_improve": "Estimates",
+        "sentiment": "positive",
+        **fields,
+    }
+    response = client.post("/feedbacks/", headers=manager["headers"], json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def register(client):
+    def register(role: str) -> dict:
+        email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post("/auth/register", json={
+            "name": f"Test {role}", "email": email, "password": "password", "role": role,
+        })
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/login", data={"username": email, "password": "password"})
+        assert response.status_code == 200, response.text
+        data = response.json()
+        return {
+            "id": data["user"]["id"],
+            "email": email,
+            "headers": {"Authorization": f"Bearer {data['access_token']}"},
+        }
+    return register
+
+
+@pytest.fixture
+def team(client, register):
+    """A manager with one employee in their team."""
+    manager, employee = register("manager"), register("employee")
+    response = client.post("/teams/assign", params={"employee_id": employee["id"]}, headers=manager["headers"])
+    assert response.status_code == 200, response.text
+    return manager, employee
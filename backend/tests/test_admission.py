@@ -0,0 +1,90 @@
+"""Admission control, against the in-memory backend; no database needed."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app import ratelimit  # noqa: E402
+
+
+class SlowBackend:
+    """Always allows, after yielding to the event loop."""
+
+    async def take(self, key, rate, burst):
+        await asyncio.sleep(0.01)
+        return 0.0
+
+
+def _request() -> Request:
+    return Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+
+
+def test_concurrency_cap_holds_while_buckets_are_checked(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "_backend", SlowBackend())
+    dependency = ratelimit.admission("dashboard")
+    cap = ratelimit.ENDPOINT_CLASSES["dashboard"].concurrency
+
+    async def enter():
+        gen = dependency(_request())
+        try:
+            await gen.__anext__()
+        except HTTPException as e:
+            return e.status_code
+        return gen
+
+    async def run():
+        results = await asyncio.gather(*(enter() for _ in range(cap * 2)))
+        admitted = [r for r in results if not isinstance(r, int)]
+        assert len(admitted) == cap
+        assert ratelimit._in_flight["dashboard"] == cap
+        for gen in admitted:
+            await gen.aclose()
+        # Rejected requests released their slot too
+        assert ratelimit._in_flight["dashboard"] == 0
+
+    asyncio.run(run())
+
+
+def _login_request(ip: str, username: str) -> Request:
+    body = f"username={username}&password=guess".encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({
+        "type": "http",
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+        "client": (ip, 1234),
+    }, receive)
+
+
+def test_login_is_limited_per_account_across_ips(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "_backend", ratelimit.MemoryBackend(1000))
+    dependency = ratelimit.admission("login")
+    burst = ratelimit.ENDPOINT_CLASSES["login"].burst
+
+    async def attempt(ip, username):
+        gen = dependency(_login_request(ip, username))
+        try:
+            await gen.__anext__()
+        except HTTPException as e:
+            return e.status_code
+        await gen.aclose()
+        return 200
+
+    async def run():
+        # A fresh IP per guess never trips the IP bucket
+        results = [await attempt(f"10.1.0.{i}", "Victim@example.com") for i in range(burst + 1)]
+        assert results[:burst] == [200] * burst
+        assert results[burst] == 429
+        # Usernames are normalised, and other accounts are unaffected
+        assert await attempt("10.2.0.1", " victim@example.com") == 429
+        assert await attempt("10.2.0.2", "other@example.com") == 200
+
+    asyncio.run(run())
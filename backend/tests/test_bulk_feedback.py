@@ -0,0 +1,55 @@
+"""POST /feedbacks/bulk: per-item results for a review cycle."""
+import uuid
+
+
+def _feedback(employee_id, **fields):
+    return {
+        "employee_id": employee_id,
+        "strengths": "Ownership",
+        "areas_to_improve": "Documentation",
+        "sentiment": "neutral",
+        **fields,
+    }
+
+
+def test_outsiders_are_rejected_and_the_rest_created(client, team, register):
+    manager, employee = team
+    outsider = register("employee")
+    tag = f"cycle-{uuid.uuid4().hex[:8]}"
+    response = client.post("/feedbacks/bulk", headers=manager["headers"], json=[
+        _feedback(employee["id"], tags=[tag]),
+        _feedback(outsider["id"]),
+        _feedback(employee["id"], sentiment="positive", tags=[tag, tag]),
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [(r["index"], r["status"]) for r in results] == [(0, "created"), (1, "rejected"), (2, "created")]
+    assert results[1]["feedback_id"] is None
+
+    items = client.get("/feedbacks/me", headers=employee["headers"]).json()["items"]
+    by_id = {item["id"]: item for item in items}
+    assert set(by_id) == {results[0]["feedback_id"], results[2]["feedback_id"]}
+    # Duplicate tag names in one feedback are stored once
+    assert [t["name"] for t in by_id[results[2]["feedback_id"]]["tags"]] == [tag]
+    assert client.get("/feedbacks/me", headers=outsider["headers"]).json()["items"] == []
+
+
+def test_pending_requests_are_fulfilled(client, team):
+    manager, employee = team
+    client.post("/feedback-requests/", json={"manager_id": manager["id"]}, headers=employee["headers"])
+    response = client.post("/feedbacks/bulk", headers=manager["headers"], json=[_feedback(employee["id"])])
+    assert response.json()[0]["status"] == "created"
+    items = client.get("/feedback-requests/notifications", headers=manager["headers"]).json()["items"]
+    assert [item["status"] for item in items] == ["fulfilled"]
+
+
+def test_only_managers_and_bounded_batches(client, team):
+    from app.routes.feedbacks import MAX_BULK_FEEDBACKS
+
+    manager, employee = team
+    response = client.post("/feedbacks/bulk", headers=employee["headers"], json=[_feedback(employee["id"])])
+    assert response.status_code == 403
+    response = client.post(
+        "/feedbacks/bulk", headers=manager["headers"], json=[_feedback(employee["id"])] * (MAX_BULK_FEEDBACKS + 1)
+    )
+    assert response.status_code == 400
@@ -0,0 +1,52 @@
+"""Streaming CSV/NDJSON export of a manager's feedback history."""
+import csv
+import io
+import json
+import uuid
+
+from tests.conftest import give_feedback
+
+
+def test_csv_and_ndjson_carry_every_row(client, team, register, monkeypatch):
+    from app.routes import feedbacks
+
+    # Several cursor batches per export
+    monkeypatch.setattr(feedbacks, "EXPORT_BATCH_SIZE", 2)
+    manager, employee = team
+    tag = f"export-{uuid.uuid4().hex[:8]}"
+    created = [
+        give_feedback(client, manager, employee, strengths='Says "no", politely\nand often', tags=[tag]),
+        give_feedback(client, manager, employee),
+        give_feedback(client, manager, employee, sentiment="negative"),
+    ]
+
+    response = client.get("/feedbacks/export", params={"format": "csv"}, headers=manager["headers"])
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [fb["id"] for fb in created]
+    assert rows[0]["strengths"] == 'Says "no", politely\nand often'
+    assert rows[0]["tags"] == tag
+    assert rows[1]["tags"] == ""
+    assert rows[0]["employee_name"] == "Test employee"
+
+    response = client.get("/feedbacks/export", params={"format": "ndjson"}, headers=manager["headers"])
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["id"] for record in records] == [fb["id"] for fb in created]
+    assert records[0]["tags"] == [tag]
+    assert records[2]["sentiment"] == "negative"
+
+
+def test_export_is_scoped_to_the_manager_and_employee(client, team, register):
+    manager, employee = team
+    give_feedback(client, manager, employee)
+    other_manager = register("manager")
+    response = client.get("/feedbacks/export", params={"format": "ndjson"}, headers=other_manager["headers"])
+    assert response.text == ""
+
+    params = {"format": "ndjson", "employee_id": str(uuid.uuid4())}
+    assert client.get("/feedbacks/export", params=params, headers=manager["headers"]).text == ""
+
+    response = client.get("/feedbacks/export", headers=employee["headers"])
+    assert response.status_code == 403
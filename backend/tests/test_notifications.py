@@ -0,0 +1,73 @@
+"""Feedback-request notifications: NOTIFY payloads and stream tokens."""
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def listener(client):
+    import asyncpg
+
+    from app.database import database_url, driver_dsn
+    from app.notifications import CHANNEL
+
+    async def listen():
+        conn = await asyncpg.connect(driver_dsn(database_url()))
+        queue = asyncio.Queue()
+        await conn.add_listener(CHANNEL, lambda conn, pid, channel, payload: queue.put_nowait(payload))
+        return conn, queue
+
+    conn, queue = client.portal.call(listen)
+
+    async def next_payload(manager_id):
+        while True:
+            payload = json.loads(await asyncio.wait_for(queue.get(), timeout=5))
+            if payload["manager_id"] == manager_id:
+                return payload
+
+    yield lambda manager_id: client.portal.call(next_payload, manager_id)
+    client.portal.call(conn.close)
+
+
+def test_payload_carries_the_list_fields(client, team, listener):
+    manager, employee = team
+    response = client.post(
+        "/feedback-requests/", json={"manager_id": manager["id"], "message": "Any thoughts?"},
+        headers=employee["headers"],
+    )
+    assert response.status_code == 200
+    payload = listener(manager["id"])
+    assert payload["id"] == response.json()["id"]
+    assert payload["message"] == "Any thoughts?"
+    assert payload["message_truncated"] is False
+    assert payload["employee_name"] == "Test employee"
+    assert payload["created_at"]
+
+
+def test_long_messages_are_truncated_to_fit(client, team, listener):
+    manager, employee = team
+    # Over 8000 bytes once JSON-escaped
+    message = "\x01" * 2000
+    response = client.post(
+        "/feedback-requests/", json={"manager_id": manager["id"], "message": message},
+        headers=employee["headers"],
+    )
+    assert response.status_code == 200
+    payload = listener(manager["id"])
+    assert payload["message_truncated"] is True
+    assert message.startswith(payload["message"])
+
+
+def test_stream_query_token_must_be_stream_scoped(client, register):
+    manager = register("manager")
+    access_token = manager["headers"]["Authorization"].removeprefix("Bearer ")
+    response = client.get("/feedback-requests/stream", params={"access_token": access_token})
+    assert response.status_code == 401
+
+    response = client.post("/feedback-requests/stream-token", headers=manager["headers"])
+    assert response.status_code == 200
+    stream_token = response.json()["token"]
+    # Not usable as a regular access token
+    response = client.get("/feedbacks/me", headers={"Authorization": f"Bearer {stream_token}"})
+    assert response.status_code == 401
@@ -0,0 +1,59 @@
+"""Keyset (cursor) pagination of the feedback and request lists."""
+from tests.conftest import give_feedback
+
+
+def _all_pages(client, path, headers, limit):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert len(body["items"]) <= limit
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_feedback_pages_cover_every_row_once_newest_first(client, team):
+    manager, employee = team
+    created = [give_feedback(client, manager, employee)["id"] for _ in range(5)]
+
+    mine = _all_pages(client, "/feedbacks/me", employee["headers"], limit=2)
+    assert mine == created[::-1]
+
+    theirs = _all_pages(client, f"/feedbacks/employee/{employee['id']}", manager["headers"], limit=2)
+    assert theirs == created[::-1]
+
+
+def test_exact_final_page_has_no_next_cursor(client, team):
+    manager, employee = team
+    for _ in range(2):
+        give_feedback(client, manager, employee)
+    response = client.get("/feedbacks/me", params={"limit": 2}, headers=employee["headers"])
+    assert len(response.json()["items"]) == 2
+    assert response.json()["next_cursor"] is None
+
+
+def test_request_notifications_are_paginated(client, team):
+    manager, employee = team
+    created = []
+    for n in range(3):
+        response = client.post(
+            "/feedback-requests/", json={"manager_id": manager["id"], "message": f"Request {n}"},
+            headers=employee["headers"],
+        )
+        created.append(response.json()["id"])
+    ids = _all_pages(client, "/feedback-requests/notifications", manager["headers"], limit=2)
+    assert ids == created[::-1]
+
+
+def test_bad_cursor_is_a_400(client, team):
+    _, employee = team
+    for cursor in ("not-a-cursor", "bm90LWEtZGF0ZXw2ZjFkYjZhZS0wMDAwLTQwMDAtODAwMC0wMDAwMDAwMDAwMDA"):
+        response = client.get("/feedbacks/me", params={"cursor": cursor}, headers=employee["headers"])
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
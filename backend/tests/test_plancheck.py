@@ -0,0 +1,44 @@
+"""Plan inspection used by python -m app.plancheck, and the check itself."""
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from app import plancheck  # noqa: E402
+from app.plancheck import _full_scans, _indexes  # noqa: E402
+
+
+def _plan(*children, **node):
+    return {**node, "Plans": list(children)}
+
+
+def test_flags_seq_scans_and_filtered_full_index_scans():
+    plan = _plan(
+        _plan(**{"Node Type": "Seq Scan", "Relation Name": "teams"}),
+        _plan(**{"Node Type": "Index Scan", "Index Name": "ix_users_role_name",
+                 "Filter": "(name ~~* '%emp%')"}),
+        _plan(**{"Node Type": "Index Scan", "Index Name": "ix_feedbacks_manager_employee_created",
+                 "Index Cond": "(manager_id = $1)", "Filter": "(sentiment = 'positive')"}),
+        **{"Node Type": "Nested Loop"},
+    )
+    assert _full_scans(plan) == ["seq scan on teams", "filtered full scan of ix_users_role_name"]
+
+
+def test_ordered_index_walk_without_filter_is_not_flagged():
+    plan = _plan(**{"Node Type": "Index Only Scan", "Index Name": "ix_feedbacks_created_at"})
+    assert _full_scans(plan) == []
+
+
+def test_collects_index_names():
+    plan = _plan(
+        _plan(**{"Node Type": "Bitmap Index Scan", "Index Name": "ix_users_name_trgm", "Index Cond": "x"}),
+        _plan(**{"Node Type": "Bitmap Index Scan", "Index Name": "ix_users_email_trgm", "Index Cond": "x"}),
+        **{"Node Type": "BitmapOr"},
+    )
+    assert _indexes(plan) == {"ix_users_name_trgm", "ix_users_email_trgm"}
+
+
+def test_hot_paths_use_their_indexes(client, capsys):
+    # Run on the app's event loop, which owns the pooled connections
+    ok = client.portal.call(plancheck.check)
+    assert ok, capsys.readouterr().out
@@ -0,0 +1,64 @@
+"""Pending feedback requests: fulfilment by feedback and batched expiry."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from tests.conftest import give_feedback
+
+
+def _request(client, manager, employee) -> str:
+    response = client.post("/feedback-requests/", json={"manager_id": manager["id"]}, headers=employee["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _statuses(client, manager) -> dict:
+    items = client.get("/feedback-requests/notifications", headers=manager["headers"]).json()["items"]
+    return {item["id"]: item["status"] for item in items}
+
+
+def _backdate(client, request_ids, days):
+    from app import models
+    from app.database import AsyncSessionLocal
+
+    async def backdate():
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(models.FeedbackRequest)
+                .where(models.FeedbackRequest.id.in_(request_ids))
+                .values(created_at=datetime.now(timezone.utc) - timedelta(days=days))
+            )
+            await db.commit()
+
+    client.portal.call(backdate)
+
+
+def test_feedback_fulfils_every_pending_request(client, team):
+    manager, employee = team
+    first, second = _request(client, manager, employee), _request(client, manager, employee)
+    give_feedback(client, manager, employee)
+    assert _statuses(client, manager) == {first: "fulfilled", second: "fulfilled"}
+
+
+def test_stale_requests_expire_in_batches(client, team, register):
+    from app.expiry import RequestExpiryWorker
+
+    manager, employee = team
+    stale = [_request(client, manager, employee) for _ in range(3)]
+    fresh = _request(client, manager, employee)
+    _backdate(client, stale, days=3)
+    # Fulfilled requests are left alone however old they are
+    other = register("employee")
+    client.post("/teams/assign", params={"employee_id": other["id"]}, headers=manager["headers"])
+    fulfilled = _request(client, manager, other)
+    give_feedback(client, manager, other)
+    _backdate(client, [fulfilled], days=3)
+
+    worker = RequestExpiryWorker(ttl_days=2, batch_size=2)
+    counts = [client.portal.call(worker.expire_once) for _ in range(3)]
+    assert counts == [2, 1, 0]
+    assert worker.stats == {"expired": 3}
+    statuses = _statuses(client, manager)
+    assert [statuses[request_id] for request_id in stale] == ["expired"] * 3
+    assert statuses[fresh] == "pending"
+    assert statuses[fulfilled] == "fulfilled"
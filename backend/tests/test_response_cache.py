@@ -0,0 +1,73 @@
+"""ETag caching of /tags and /dashboard, and invalidation on writes."""
+import uuid
+
+import pytest
+
+from tests.conftest import give_feedback
+
+
+def test_unchanged_tags_are_a_304_until_a_tag_is_created(client):
+    first = client.get("/tags/")
+    etag = first.headers["etag"]
+    assert client.get("/tags/", headers={"If-None-Match": etag}).status_code == 304
+
+    name = f"tag-{uuid.uuid4().hex[:8]}"
+    assert client.post("/tags/", json={"name": name}).status_code == 200
+    response = client.get("/tags/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert name in {tag["name"] for tag in response.json()}
+
+
+def test_dashboard_is_invalidated_by_new_feedback(client, team):
+    manager, employee = team
+    first = client.get("/dashboard", headers=manager["headers"])
+    etag = first.headers["etag"]
+    assert client.get("/dashboard", headers={**manager["headers"], "If-None-Match": etag}).status_code == 304
+
+    give_feedback(client, manager, employee, sentiment="negative")
+    response = client.get("/dashboard", headers={**manager["headers"], "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["sentiment_summary"]["negative"] == 1
+
+
+@pytest.fixture
+def lagging_replica(client, monkeypatch):
+    """Serve get_read_db from a snapshot taken before the test's writes."""
+    from sqlalchemy import text
+
+    from app import database
+    from app.main import app
+
+    async def open_snapshot():
+        session = database.AsyncSessionLocal()
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        await session.execute(text("SELECT 1"))
+        return session
+
+    snapshot = client.portal.call(open_snapshot)
+
+    async def read_db():
+        yield snapshot
+
+    monkeypatch.setattr(database, "READ_DATABASE_URL", "postgresql+asyncpg://replica/unused")
+    app.dependency_overrides[database.get_read_db] = read_db
+    yield snapshot
+    del app.dependency_overrides[database.get_read_db]
+    client.portal.call(snapshot.close)
+
+
+def test_first_fill_after_a_write_reads_the_primary(client, lagging_replica):
+    from sqlalchemy import select
+
+    from app import models
+
+    name = f"tag-{uuid.uuid4().hex[:8]}"
+    assert client.post("/tags/", json={"name": name}).status_code == 200
+
+    async def replica_names():
+        return set((await lagging_replica.execute(select(models.Tag.name))).scalars())
+
+    # The "replica" has not seen the write...
+    assert name not in client.portal.call(replica_names)
+    # ...but the cache is refilled from the primary
+    assert name in {tag["name"] for tag in client.get("/tags/").json()}
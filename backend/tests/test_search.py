@@ -0,0 +1,44 @@
+"""Full-text feedback search: ranking, filters and ownership."""
+import uuid
+
+from tests.conftest import give_feedback
+
+
+def test_results_are_ranked_and_scoped_to_the_owner(client, team, register):
+    manager, employee = team
+    passing = give_feedback(client, manager, employee, strengths="Mentoring the new hires")
+    strong = give_feedback(
+        client, manager, employee,
+        strengths="Mentoring juniors, mentored two interns", areas_to_improve="More mentoring time",
+    )
+    give_feedback(client, manager, employee, strengths="Quarterly planning")
+
+    response = client.get("/feedbacks/search", params={"q": "mentoring"}, headers=manager["headers"])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["id"] for r in results] == [strong["id"], passing["id"]]
+    assert results[0]["rank"] > results[1]["rank"]
+
+    # The employee finds what they received; other managers find nothing
+    response = client.get("/feedbacks/search", params={"q": "mentoring"}, headers=employee["headers"])
+    assert {r["id"] for r in response.json()} == {strong["id"], passing["id"]}
+    other_manager = register("manager")
+    response = client.get("/feedbacks/search", params={"q": "mentoring"}, headers=other_manager["headers"])
+    assert response.json() == []
+
+
+def test_tag_and_sentiment_filters(client, team):
+    manager, employee = team
+    tag = f"search-{uuid.uuid4().hex[:8]}"
+    tagged = give_feedback(client, manager, employee, strengths="Careful reviews", tags=[tag, "other"])
+    negative = give_feedback(client, manager, employee, strengths="Careful reviews", sentiment="negative")
+
+    response = client.get("/feedbacks/search", params={"q": "reviews", "tag": tag}, headers=manager["headers"])
+    results = response.json()
+    assert [r["id"] for r in results] == [tagged["id"]]
+    # Every tag of a match comes back, not just the filtered one
+    assert {t["name"] for t in results[0]["tags"]} == {tag, "other"}
+
+    params = {"q": "reviews", "sentiment": "negative"}
+    response = client.get("/feedbacks/search", params=params, headers=manager["headers"])
+    assert [r["id"] for r in response.json()] == [negative["id"]]
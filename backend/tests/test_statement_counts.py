@@ -0,0 +1,107 @@
+"""Upper bounds on the statements each write endpoint issues.
+
+Counts come from the Server-Timing header added by SQLTimingMiddleware.
+Each bound includes the user lookup on a principal cache miss; raise a
+bound only together with the change that needs it.
+"""
+import uuid
+
+from tests.conftest import statement_count
+
+
+def test_register(client):
+    email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+    body = {"name": "New", "email": email, "password": "password", "role": "employee"}
+    response = client.post("/auth/register", json=body)
+    assert response.status_code == 200
+    # existence check + INSERT ... RETURNING
+    assert statement_count(response) <= 2
+
+    # Duplicates stop at the existence check, before any hashing
+    response = client.post("/auth/register", json=body)
+    assert response.status_code == 400
+    assert statement_count(response) <= 1
+
+
+def test_login(client, register):
+    user = register("employee")
+    response = client.post("/auth/login", data={"username": user["email"], "password": "password"})
+    assert response.status_code == 200
+    # user lookup (+ rehash UPDATE)
+    assert statement_count(response) <= 2
+
+
+def test_create_feedback(client, team):
+    manager, employee = team
+    client.post("/feedback-requests/", json={"manager_id": manager["id"]}, headers=employee["headers"])
+    response = client.post("/feedbacks/", headers=manager["headers"], json={
+        "employee_id": employee["id"],
+        "strengths": "Clear communication",
+        "areas_to_improve": "Estimates",
+        "sentiment": "positive",
+        "tags": [f"tag-{uuid.uuid4().hex[:8]}", "communication"],
+    })
+    assert response.status_code == 200
+    # user, tags (2), feedback, rollup, feedback_tags, fulfil requests, notify
+    assert statement_count(response) <= 8
+
+
+def test_create_feedbacks_bulk(client, team):
+    manager, employee = team
+    feedback = {
+        "employee_id": employee["id"],
+        "strengths": "Ownership",
+        "areas_to_improve": "Documentation",
+        "sentiment": "neutral",
+        "tags": ["ownership"],
+    }
+    response = client.post("/feedbacks/bulk", headers=manager["headers"], json=[feedback] * 20)
+    assert response.status_code == 200
+    assert all(result["status"] == "created" for result in response.json())
+    # Independent of batch size: user, team, tags (2), feedbacks, rollup,
+    # feedback_tags, fulfil requests, notify
+    assert statement_count(response) <= 9
+
+
+def test_acknowledge_feedback(client, team):
+    manager, employee = team
+    response = client.post("/feedbacks/", headers=manager["headers"], json={
+        "employee_id": employee["id"],
+        "strengths": "Testing",
+        "areas_to_improve": "Pace",
+        "sentiment": "neutral",
+    })
+    feedback_id = response.json()["id"]
+    response = client.patch(
+        f"/feedbacks/{feedback_id}/acknowledge", headers=employee["headers"], json={"reply": "Thanks"}
+    )
+    assert response.status_code == 200
+    assert response.json()["acknowledged"] is True
+    # user + UPDATE ... RETURNING with tags
+    assert statement_count(response) <= 2
+
+
+def test_request_feedback(client, team):
+    manager, employee = team
+    response = client.post(
+        "/feedback-requests/", json={"manager_id": manager["id"], "message": "Any thoughts?"},
+        headers=employee["headers"],
+    )
+    assert response.status_code == 200
+    # user, manager lookup, INSERT ... RETURNING, notify, outbox insert
+    assert statement_count(response) <= 5
+
+
+def test_assign_employee(client, register):
+    manager, employee = register("manager"), register("employee")
+    response = client.post("/teams/assign", params={"employee_id": employee["id"]}, headers=manager["headers"])
+    assert response.status_code == 200
+    # user, employee lookup, membership check, insert
+    assert statement_count(response) <= 4
+
+
+def test_create_tag(client):
+    response = client.post("/tags/", json={"name": f"tag-{uuid.uuid4().hex[:8]}"})
+    assert response.status_code == 200
+    # existence check, insert, refresh
+    assert statement_count(response) <= 3
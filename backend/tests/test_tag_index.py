@@ -0,0 +1,70 @@
+"""TagIndex reloads, against a fake session; no database needed."""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from app import tags  # noqa: E402
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Returns ``rows`` for the tag usage query once ``release`` is set."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.release = asyncio.Event()
+
+    async def execute(self, stmt):
+        await self.release.wait()
+        return FakeResult(self.rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_stale_index_is_served_while_reloading(monkeypatch):
+    python, pytest_id, pydantic_id = uuid4(), uuid4(), uuid4()
+
+    async def run():
+        index = tags.TagIndex(ttl=0)
+        first = FakeSession([(python, "python", 3), (pytest_id, "pytest", 1)])
+        first.release.set()
+        await index.ensure_loaded(first)
+
+        reload = FakeSession([(python, "python", 5), (pytest_id, "pytest", 1)])
+        monkeypatch.setattr(tags, "ReadSessionLocal", lambda: reload)
+        await index.ensure_loaded(first)
+        await asyncio.sleep(0)
+
+        # The reload is waiting on the database; the old index is served
+        assert [t["name"] for t in index.suggest("py", 10)] == ["python", "pytest"]
+
+        # Writes during the reload land in the current index and are replayed
+        # onto the reloaded one
+        index.add("pytest", pytest_id, 10)
+        index.add("pydantic", pydantic_id, 1)
+        assert index.suggest("pyt", 1)[0]["uses"] == 11
+
+        reload.release.set()
+        await index._refresh
+        assert index.suggest("py", 10) == [
+            {"id": pytest_id, "name": "pytest", "uses": 11},
+            {"id": python, "name": "python", "uses": 5},
+            {"id": pydantic_id, "name": "pydantic", "uses": 1},
+        ]
+
+    asyncio.run(run())
@@ -0,0 +1,55 @@
+"""Sentiment trends served from the feedback_sentiment_rollups table."""
+from datetime import datetime, timedelta, timezone
+
+from tests.conftest import give_feedback
+
+
+def _current_buckets():
+    today = datetime.now(timezone.utc).date()
+    return {"week": today - timedelta(days=today.weekday()), "month": today.replace(day=1)}
+
+
+def test_single_and_bulk_writes_are_rolled_up(client, team, register):
+    manager, employee = team
+    other = register("employee")
+    client.post("/teams/assign", params={"employee_id": other["id"]}, headers=manager["headers"])
+    give_feedback(client, manager, employee, sentiment="positive")
+    give_feedback(client, manager, employee, sentiment="negative")
+    response = client.post("/feedbacks/bulk", headers=manager["headers"], json=[
+        {"employee_id": other["id"], "strengths": "s", "areas_to_improve": "a", "sentiment": "positive"},
+        {"employee_id": employee["id"], "strengths": "s", "areas_to_improve": "a", "sentiment": "neutral"},
+    ])
+    assert response.status_code == 200
+
+    buckets = _current_buckets()
+    for period in ("week", "month"):
+        response = client.get("/dashboard/trends", params={"period": period}, headers=manager["headers"])
+        assert response.status_code == 200
+        body = response.json()
+        assert body["buckets"] == [{
+            "bucket": buckets[period].isoformat(), "positive": 2, "neutral": 1, "negative": 1, "total": 4,
+        }]
+
+    params = {"employee_id": employee["id"]}
+    response = client.get("/dashboard/trends", params=params, headers=manager["headers"])
+    assert response.json()["buckets"][0] == {
+        "bucket": buckets["week"].isoformat(), "positive": 1, "neutral": 1, "negative": 1, "total": 3,
+    }
+
+
+def test_rebuild_matches_the_incremental_rollup(client, team):
+    from app import trends
+
+    manager, employee = team
+    give_feedback(client, manager, employee, sentiment="positive")
+    give_feedback(client, manager, employee, sentiment="positive")
+    before = client.get("/dashboard/trends", headers=manager["headers"]).json()
+
+    client.portal.call(trends.rebuild)
+    assert client.get("/dashboard/trends", headers=manager["headers"]).json() == before
+
+    # Buckets outside the requested range are left out
+    next_week = (datetime.now(timezone.utc).date() + timedelta(days=7)).isoformat()
+    response = client.get("/dashboard/trends", params={"since": next_week}, headers=manager["headers"])
+    assert response.json()["buckets"] == []
+    assert client.get("/dashboard/trends", headers=employee["headers"]).status_code == 403
@@ -0,0 +1,53 @@
+"""Unassigned employee listing: prefix search and name keyset pages."""
+import uuid
+
+
+def _employee(client, name: str) -> dict:
+    email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/auth/register", json={
+        "name": name, "email": email, "password": "password", "role": "employee",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_pages_by_name_and_excludes_assigned(client, register):
+    manager = register("manager")
+    prefix = f"Unassigned{uuid.uuid4().hex[:8]}"
+    names = [f"{prefix} {suffix}" for suffix in ("Carol", "Alice", "Dave", "Bob")]
+    employees = {name: _employee(client, name) for name in names}
+    assigned = employees[f"{prefix} Dave"]
+    response = client.post("/teams/assign", params={"employee_id": assigned["id"]}, headers=manager["headers"])
+    assert response.status_code == 200, response.text
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": prefix.lower(), "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/unassigned-employees", params=params, headers=manager["headers"])
+        assert response.status_code == 200, response.text
+        body = response.json()
+        seen.extend(user["name"] for user in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [f"{prefix} {suffix}" for suffix in ("Alice", "Bob", "Carol")]
+
+    # Email prefixes match too
+    email = employees[f"{prefix} Bob"]["email"]
+    response = client.get("/unassigned-employees", params={"q": email}, headers=manager["headers"])
+    assert [user["email"] for user in response.json()["items"]] == [email]
+
+
+def test_wildcards_are_literal_and_managers_only(client, register):
+    manager, employee = register("manager"), register("employee")
+    prefix = f"Pct{uuid.uuid4().hex[:8]}"
+    _employee(client, f"{prefix}%x")
+    _employee(client, f"{prefix}yx")
+    response = client.get("/unassigned-employees", params={"q": f"{prefix}%"}, headers=manager["headers"])
+    assert [user["name"] for user in response.json()["items"]] == [f"{prefix}%x"]
+
+    response = client.get("/unassigned-employees", params={"cursor": "!!"}, headers=manager["headers"])
+    assert response.status_code == 400
+    assert client.get("/unassigned-employees", headers=employee["headers"]).status_code == 403
@@ -7,13 +7,14 @@ import { SparklesIcon, MessageCircleIcon } from "lucide-react";
 import { Badge } from "@/components/ui/badge";
 import toast from "react-hot-toast";
 import { useAuth } from "@/hooks/useAuth";
+import { useCursorPages } from "@/hooks/useCursorPages";
 
 
 export default function EmployeeDashboard() {
   const { fetcher, apiClient } = useAuth();
 
   // Get feedbacks
-  const { data, error, isLoading } = useSWR("/feedbacks/me", fetcher);
+  const { items, error, isLoading, hasMore, isLoadingMore, loadMore } = useCursorPages("/feedbacks/me", fetcher);
 
   // Get assigned manager
   const { data: teamData } = useSWR("/feedback-requests/my-manager", fetcher);
@@ -70,10 +71,10 @@ export default function EmployeeDashboard() {
       {/* Feedback History */}
       <div className="space-y-6 w-full">
         <h2 className="text-xl font-semibold">Your Feedback History</h2>
-        {data.length === 0 ? (
+        {items.length === 0 ? (
           <p>No feedbacks yet.</p>
         ) : (
-          data.map((fb: any) => (
+          items.map((fb: any) => (
             <Card key={fb.id} className="border rounded-xl shadow-sm">
               <CardHeader className="flex flex-row justify-between items-start">
                 <CardTitle className="text-md">From Manager</CardTitle>
@@ -98,6 +99,11 @@ export default function EmployeeDashboard() {
             </Card>
           ))
         )}
+        {hasMore && (
+          <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </Button>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,25 @@
+import useSWRInfinite from "swr/infinite";
+
+// Follows the backend's keyset pagination ({ items, next_cursor }) page by page
+export function useCursorPages(path: string, fetcher: (url: string) => Promise<any>) {
+  const getKey = (pageIndex: number, previous: any) => {
+    if (pageIndex === 0) return path;
+    if (!previous?.next_cursor) return null;
+    return `${path}?cursor=${encodeURIComponent(previous.next_cursor)}`;
+  };
+
+  const { data, error, isLoading, isValidating, size, setSize } = useSWRInfinite(getKey, fetcher);
+
+  const items = data ? data.flatMap((page: any) => page.items) : [];
+  const hasMore = Boolean(data && data[data.length - 1]?.next_cursor);
+  const isLoadingMore = isValidating && Boolean(data) && data!.length < size;
+
+  return {
+    items,
+    error,
+    isLoading,
+    hasMore,
+    isLoadingMore,
+    loadMore: () => setSize(size + 1),
+  };
+}
@@ -3,8 +3,8 @@ import { Badge } from "@/components/ui/badge";
 import { ArrowLeftIcon, MessageCircleIcon, SparklesIcon } from "lucide-react";
 import { Skeleton } from "@/components/ui/skeleton";
 import { useParams } from "react-router-dom";
-import useSWR from "swr";
 import { useAuth } from "@/hooks/useAuth";
+import { useCursorPages } from "@/hooks/useCursorPages";
 import { Button } from "@/components/ui/button";
 import { useNavigate } from "react-router-dom";
 
@@ -12,7 +12,7 @@ export default function EmployeeDetailPage() {
   const navigate = useNavigate();
   const { id } = useParams();
   const { fetcher } = useAuth();
-  const { data, error, isLoading } = useSWR(
+  const { items, error, isLoading, hasMore, isLoadingMore, loadMore } = useCursorPages(
     `/feedbacks/employee/${id}`,
     fetcher
   );
@@ -30,7 +30,7 @@ export default function EmployeeDetailPage() {
         <h1 className="text-3xl font-bold mb-6">Feedback Summary</h1>
       </div>
       <div className="space-y-6">
-        {data?.map((fb: any) => (
+        {items.map((fb: any) => (
           <Card
             key={fb.id}
             className="shadow-md border border-muted rounded-2xl hover:border-primary transition"
@@ -104,6 +104,11 @@ export default function EmployeeDetailPage() {
             </CardContent>
           </Card>
         ))}
+        {hasMore && (
+          <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </Button>
+        )}
       </div>
     </div>
   );